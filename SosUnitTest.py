@@ -1,6 +1,22 @@
 import unittest
-from sosGameLogic import SOSGameLogic, ComputerPlayer
-from sosGui import SetupWindow
+from sosGameLogic import (SOSGameLogic, ComputerPlayer, SOSBitboard, TranspositionTable,
+                          SparseSOSGameLogic, SearchProfiler, canonical_moves, transform_move,
+                          make_game_logic, _triplet_index)
+import random
+import threading
+import tempfile
+from pathlib import Path
+import sosSelfPlay
+import sosBatch
+import sosAnalytics
+import sosBook
+import sosPlayout
+import sosBench
+import sosServer
+import asyncio
+from sosLog import read_log, BinaryLogReader, BinaryLogWriter
+from sosMcts import MCTSNode, WIDEN_VISITS
+from sosGui import SetupWindow, SOSGame, SOSReplay, SOSBoardWidget
 from unittest.mock import MagicMock, patch
 from PyQt5.QtWidgets import QApplication
 class TestSOSGame(unittest.TestCase):
@@ -199,5 +215,689 @@ class TestComputerPlayer(unittest.TestCase):
         move = self.ai.choose_move(self.game)
         self.assertNotEqual((1, 1), (move[0], move[1]), "AI should avoid already filled cells")
 
+    def test_ai_keeps_chosen_letter(self):
+        """AI should complete S_S with an O even when playing Blue."""
+        game = SOSGameLogic(size=4, mode="simple")
+        game.make_move(0, 0, "S")
+        game.make_move(3, 3, "O")
+        game.make_move(0, 2, "S")
+        game.make_move(3, 0, "O")
+        ai = ComputerPlayer(player_color="Blue", time_budget_ms=200)
+        self.assertEqual(ai.choose_move(game), (0, 1, "O"))
+
+    def test_ai_takes_extra_turns_into_account(self):
+        """In General mode the search should chain SOS moves it keeps the turn for."""
+        game = SOSGameLogic(size=3, mode="general")
+        for row, col, letter in [(0, 0, "S"), (0, 1, "O"), (1, 0, "O"),
+                                 (2, 2, "S"), (1, 2, "O")]:
+            game.push_move(row, col, letter)
+        ai = ComputerPlayer(player_color=game.current_player, time_budget_ms=2000)
+        value, move = ai.minimax(game, game.empty_count, float("-inf"), float("inf"))
+        # S at (0,2) scores twice and keeps the turn; the mover then takes the
+        # remaining cells for every line on the board
+        self.assertEqual(move, (0, 2, "S"))
+        self.assertEqual(value, 6)
+
+    def test_cancelled_search_returns_none(self):
+        """A set cancellation token should stop the search without a move."""
+        cancel = threading.Event()
+        cancel.set()
+        ai = ComputerPlayer(player_color="Blue", time_budget_ms=5000)
+        self.assertIsNone(ai.choose_move(SOSGameLogic(6, "general"), cancel=cancel))
+
+    def test_progress_reported_per_depth(self):
+        reports = []
+        ai = ComputerPlayer(player_color="Blue", max_depth=2, time_budget_ms=5000)
+        ai.choose_move(SOSGameLogic(3, "general"), progress=reports.append)
+        self.assertEqual([report["depth"] for report in reports], [1, 2])
+
+    def test_parallel_search_agrees_on_forced_move(self):
+        """Root-split search across processes should still find the winning move."""
+        game = SOSGameLogic(size=4, mode="simple")
+        for move in [(0, 0, "S"), (3, 3, "O"), (0, 2, "S"), (3, 0, "O")]:
+            game.make_move(*move)
+        ai = ComputerPlayer(player_color="Blue", max_depth=2, time_budget_ms=5000, workers=2)
+        try:
+            with patch("sosGameLogic.os.cpu_count", return_value=2):
+                self.assertEqual(ai.choose_move(game), (0, 1, "O"))
+        finally:
+            ai.close()
+
+    def test_parallel_search_runs_inline_on_one_cpu(self):
+        ai = ComputerPlayer(player_color="Blue", max_depth=2, time_budget_ms=5000, workers=2)
+        with patch("sosGameLogic.os.cpu_count", return_value=1):
+            self.assertIsNotNone(ai.choose_move(SOSGameLogic(3, "general")))
+        self.assertIsNone(ai._pool)
+
+    def test_parallel_search_reports_progress_and_cancels(self):
+        reports = []
+        cancel = threading.Event()
+        ai = ComputerPlayer(player_color="Blue", max_depth=2, time_budget_ms=5000, workers=2)
+        try:
+            with patch("sosGameLogic.os.cpu_count", return_value=2):
+                ai.choose_move(SOSGameLogic(3, "general"), progress=reports.append)
+                cancel.set()
+                cancelled = ai.choose_move(SOSGameLogic(6, "general"), cancel=cancel)
+        finally:
+            ai.close()
+        self.assertEqual(sorted((report["worker"], report["depth"]) for report in reports),
+                         [(0, 1), (0, 2), (1, 1), (1, 2)])
+        self.assertIsNone(cancelled)
+
+    def test_move_ordering_and_pruning(self):
+        """Completing moves come first, then blocks, then cells near letters."""
+        game = SOSGameLogic(size=7, mode="general")
+        game.push_move(0, 0, "S")
+        game.push_move(0, 1, "O")
+        ordered = ComputerPlayer(player_color="Blue")._moves(game)
+        self.assertEqual(ordered[:2], [(0, 2, "S"), (0, 2, "O")])
+        self.assertEqual(len(ordered), 2 * game.empty_count)
+        pruned = ComputerPlayer(player_color="Blue", prune=True)._moves(game)
+        self.assertEqual(len(pruned), 2 * (4 * 3 - 2))
+        self.assertNotIn((6, 6, "S"), pruned)
+
+    def test_mcts_completes_sos_and_reuses_tree(self):
+        """MCTS should take a winning SOS and keep its subtree for the next move."""
+        game = SOSGameLogic(size=5, mode="simple")
+        for move in [(0, 0, "S"), (4, 4, "O"), (0, 2, "S"), (4, 0, "O")]:
+            game.make_move(*move)
+        ai = ComputerPlayer(player_color="Blue", strategy="mcts",
+                            playouts=400, time_budget_ms=10 ** 6, seed=1)
+        result = ai.search(game)
+        self.assertEqual(result.move, (0, 1, "O"))
+        self.assertEqual((result.source, result.nodes), ("mcts", 400))
+        self.assertEqual(game.empty_count, 21)
+
+        game.make_move(*result.move)
+        reused = ai._mcts._reuse([(r, c, game.board[r][c]) for r, c, _, _ in game._history])
+        self.assertGreater(reused.visits, 0)
+
+    def test_mcts_widens_to_moves_that_open_an_sos(self):
+        """Moves handing Blue an SOS are expanded once the root has enough visits."""
+        game = SOSGameLogic(size=5, mode="simple")
+        game.make_move(0, 0, "S")
+        ai = ComputerPlayer(player_color="Red", strategy="mcts", playouts=1, seed=1)
+        ai.search(game)
+        root = MCTSNode()
+        with patch("sosMcts.WIDEN_BELOW", 1.01):
+            for _ in range(2 * WIDEN_VISITS + 8):
+                ai._mcts._iterate(game, root)
+        # six moves open an SOS next to (0, 0); two have been admitted so far
+        self.assertEqual((root.widened, len(root.deferred)), (2, 4))
+        self.assertIn((0, 1, "O"), [child.move for child in root.children])
+
+        # while a quiet move still wins often enough, none are admitted
+        root = MCTSNode()
+        with patch("sosMcts.WIDEN_BELOW", 0.0):
+            for _ in range(2 * WIDEN_VISITS + 8):
+                ai._mcts._iterate(game, root)
+        self.assertEqual((root.widened, len(root.deferred)), (0, 6))
+
+    def test_mcts_hands_the_endgame_to_alpha_beta(self):
+        """strategy="mcts" searches with alpha-beta once few enough cells are empty."""
+        game = SOSGameLogic(size=4, mode="general")
+        for row, col, letter in ((0, 0, "S"), (1, 1, "O"), (3, 3, "S"), (2, 0, "O")):
+            game.make_move(row, col, letter)
+        ai = ComputerPlayer(player_color=game.current_player, strategy="mcts",
+                            playouts=50, seed=1, endgame=game.empty_count)
+        self.assertEqual(ai.search(game).source, "search")
+        ai = ComputerPlayer(player_color=game.current_player, strategy="mcts",
+                            playouts=50, seed=1, endgame=0)
+        self.assertEqual(ai.search(game).source, "mcts")
+
+    def test_search_result_statistics(self):
+        """search() should report its work and the stats should reach the log."""
+        game = SOSGameLogic(size=4, mode="general")
+        ai = ComputerPlayer(player_color="Blue", max_depth=3, time_budget_ms=10 ** 6,
+                            profiler=SearchProfiler(use_cprofile=False))
+        result = ai.search(game)
+        self.assertIs(ai.last_result, result)
+        self.assertEqual((result.depth, result.source), (3, "search"))
+        self.assertGreater(result.nodes, result.expanded)
+        self.assertGreater(result.cutoffs, 0)
+        self.assertGreater(result.nps, 0)
+        self.assertEqual(sum(ai.profiler.histogram().values()), 1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "game.sos.jsonl"
+            game.start_recording(path)
+            game.make_move(*result.move, search=result.as_dict())
+            game.stop_recording()
+            self.assertIn('"search":{"move":', path.read_text())
+            self.assertEqual(len(read_log(path)["moves"]), 1)
+
+    def test_clone_is_independent(self):
+        game = SOSGameLogic(4, "general")
+        game.make_move(0, 0, "S")
+        copy = game.clone()
+        copy.make_move(0, 1, "O")
+        self.assertEqual(game.board[0][1], "-")
+        self.assertEqual(game.empty_count, 15)
+        copy.pop_move()
+        self.assertEqual(copy.zobrist, game.zobrist)
+
+class TestSOSBitboard(unittest.TestCase):
+    def test_matches_list_board(self):
+        """Bitboard engine should give the same results as SOSGameLogic."""
+        rng = random.Random(7)
+        for mode in ("simple", "general"):
+            for size in (3, 5, 8):
+                logic = SOSGameLogic(size, mode)
+                bits = SOSBitboard(size, mode)
+                cells = [(r, c) for r in range(size) for c in range(size)]
+                rng.shuffle(cells)
+                for r, c in cells:
+                    letter = rng.choice("SO")
+                    result = logic.make_move(r, c, letter)
+                    self.assertEqual(result, bits.make_move(r, c, letter))
+                    self.assertEqual(logic.sos_lines, bits.sos_lines)
+                    self.assertEqual(logic.scores, bits.scores)
+                    self.assertEqual(logic.current_player, bits.current_player)
+                    if result != "continue":
+                        break
+                self.assertEqual(logic.board, bits.board)
+
+    def test_board_full_uses_counter(self):
+        """is_board_full should follow the empty-cell counter."""
+        bits = SOSBitboard(3, "general")
+        for r in range(3):
+            for c in range(3):
+                self.assertFalse(bits.is_board_full())
+                bits.make_move(r, c, "O")
+        self.assertTrue(bits.is_board_full())
+        self.assertEqual(bits.empty_count, 0)
+
+class TestSparseGame(unittest.TestCase):
+    def test_matches_dense_engine(self):
+        """Same moves, same results, scores and threat counts as the dense board."""
+        rng = random.Random(5)
+        dense = SOSGameLogic(size=7, mode="general")
+        sparse = SparseSOSGameLogic(size=7, mode="general")
+        cells = [(r, c) for r in range(7) for c in range(7)]
+        rng.shuffle(cells)
+        for row, col in cells:
+            letter = rng.choice("SO")
+            self.assertEqual(sparse.make_move(row, col, letter), dense.make_move(row, col, letter))
+            self.assertEqual((sparse.scores, sparse.threat_count, sparse.current_player),
+                             (dense.scores, dense.threat_count, dense.current_player))
+        self.assertEqual([list(row) for row in sparse.board], dense.board)
+        self.assertEqual(sparse.sos_lines, dense.sos_lines)
+
+    def test_large_board_stays_sparse(self):
+        game = make_game_logic(500, "general")
+        self.assertIsInstance(game, SparseSOSGameLogic)
+        self.assertEqual(game.candidate_cells(), [(250, 250)])
+        game.make_move(0, 0, "S")
+        game.make_move(0, 1, "O")
+        self.assertEqual(sum(len(row.keys()) for row in game.board), 2)
+        self.assertEqual(len(game.candidate_cells()), 4 * 3 - 2)
+        move = ComputerPlayer(player_color=game.current_player, time_budget_ms=200).choose_move(game)
+        self.assertEqual(move, (0, 2, "S"))
+        self.assertEqual(game.clone().board[0][1], "O")
+
+class TestTripletIndex(unittest.TestCase):
+    def test_index_is_shared_per_size(self):
+        """Games of the same size should reuse one triplet index."""
+        self.assertIs(SOSGameLogic(6)._triplets, SOSGameLogic(6)._triplets)
+        self.assertIs(_triplet_index(6), SOSGameLogic(6)._triplets)
+
+    def test_cell_triplet_counts(self):
+        """Centre of a 5x5 board lies on 12 triplets, a corner on 3."""
+        index = _triplet_index(5)
+        self.assertEqual(len(index[2 * 5 + 2]), 12)
+        self.assertEqual(len(index[0]), 3)
+
+    def test_check_sos_anti_diagonal(self):
+        """check_sos should find an anti-diagonal line from any of its cells."""
+        game = SOSGameLogic(5, "general")
+        game.board[0][4] = "S"
+        game.board[1][3] = "O"
+        game.board[2][2] = "S"
+        self.assertTrue(game.check_sos(2, 2))
+        self.assertTrue(game.check_sos(0, 4))
+        self.assertEqual(game.sos_lines, {((0, 4), (1, 3), (2, 2))})
+        self.assertEqual(game.scores["Blue"], 1)
+
+class TestMoveStack(unittest.TestCase):
+    def test_pop_restores_state(self):
+        """pop_move should undo board, lines, scores, player and empty count."""
+        game = SOSGameLogic(4, "general")
+        game.push_move(0, 0, "S")
+        game.push_move(0, 1, "O")
+        state = ([row[:] for row in game.board], set(game.sos_lines),
+                 dict(game.scores), game.current_player, game.empty_count)
+
+        self.assertEqual(game.push_move(0, 2, "S"), 1)
+        self.assertEqual(game.scores["Blue"], 1)
+        self.assertEqual(game.current_player, "Blue")  # SOS keeps the turn
+
+        self.assertEqual(game.pop_move(), (0, 2))
+        self.assertEqual(state, (game.board, game.sos_lines, game.scores,
+                                 game.current_player, game.empty_count))
+
+    def test_ai_search_leaves_game_untouched(self):
+        """choose_move should not change the live game state."""
+        game = SOSGameLogic(4, "general")
+        game.make_move(1, 1, "S")
+        game.make_move(1, 2, "O")
+        state = ([row[:] for row in game.board], set(game.sos_lines),
+                 dict(game.scores), game.current_player, game.empty_count)
+        ComputerPlayer(player_color=game.current_player).choose_move(game)
+        self.assertEqual(state, (game.board, game.sos_lines, game.scores,
+                                 game.current_player, game.empty_count))
+
+    def test_threat_count_tracks_open_slots(self):
+        """threat_count should follow cells that would complete an SOS."""
+        game = SOSGameLogic(5, "general")
+        game.push_move(2, 1, "S")
+        self.assertEqual(game.threat_count, 0)
+        game.push_move(2, 2, "O")
+        self.assertEqual(game.threat_count, 1)  # S at (2,3)
+        game.push_move(0, 1, "S")
+        self.assertEqual(game.threat_count, 2)  # plus O at (1,1)
+        game.push_move(2, 3, "S")
+        self.assertEqual(game.threat_count, 2)  # (2,3) filled, O at (1,2) opens
+        game.pop_move()
+        game.pop_move()
+        self.assertEqual(game.threat_count, 1)
+        game.pop_move()
+        self.assertEqual(game.threat_count, 0)
+
+    def test_sos_events_and_cell_index(self):
+        """Every SOS is recorded once with its move and owner, and indexed by cell."""
+        row_line = ((0, 0), (0, 1), (0, 2))
+        anti_line = ((0, 2), (1, 1), (2, 0))
+        for game in (SOSGameLogic(5, "general"), SparseSOSGameLogic(25, "general")):
+            for move in [(0, 0, "S"), (0, 1, "O"), (0, 2, "S"), (2, 0, "S"), (1, 1, "O")]:
+                game.make_move(*move)
+            first, second = (2, "Blue", row_line), (4, "Red", anti_line)
+            self.assertEqual(game.sos_events, [first, second])
+            self.assertEqual(game.lines_through(0, 2), [first, second])
+            self.assertEqual(game.lines_through(1, 1), [second])
+            self.assertEqual(game.lines_through(4, 4), [])
+            self.assertEqual([game.lines_at(k) for k in (2, 3, 5)], [[], [first], [first, second]])
+
+            copy = game.clone()
+            game.pop_move()
+            self.assertEqual(game.sos_events, [first])
+            self.assertEqual(game.lines_through(1, 1), [])
+            self.assertEqual(copy.lines_through(1, 1), [second])
+
+class TestZobrist(unittest.TestCase):
+    def test_transposed_moves_share_hash(self):
+        """The same position reached in a different order should hash the same."""
+        first = SOSGameLogic(4, "simple")
+        second = SOSGameLogic(4, "simple")
+        for move in [(0, 0, "S"), (1, 1, "O"), (2, 2, "O"), (3, 3, "S")]:
+            first.push_move(*move)
+        for move in [(2, 2, "O"), (3, 3, "S"), (0, 0, "S"), (1, 1, "O")]:
+            second.push_move(*move)
+        self.assertEqual(first.zobrist, second.zobrist)
+
+    def test_pop_restores_hash(self):
+        game = SOSGameLogic(5, "general")
+        start = game.zobrist
+        game.push_move(2, 2, "S")
+        self.assertNotEqual(start, game.zobrist)
+        game.pop_move()
+        self.assertEqual(start, game.zobrist)
+
+    def test_table_replacement_and_counters(self):
+        table = TranspositionTable(capacity=4)
+        table.store(1, 3, TranspositionTable.EXACT, 5, (0, 0, "S"))
+        table.store(5, 1, TranspositionTable.EXACT, 7, (0, 1, "S"))  # same slot, shallower
+        self.assertEqual(table.probe(1)[3], 5)
+        self.assertIsNone(table.probe(5))
+        table.new_search()
+        table.store(5, 1, TranspositionTable.EXACT, 7, (0, 1, "S"))  # old entry is stale
+        self.assertEqual(table.probe(5)[3], 7)
+        self.assertEqual((table.probes, table.hits, table.overwrites), (3, 2, 1))
+
+    def test_search_uses_table(self):
+        ai = ComputerPlayer(player_color="Blue", time_budget_ms=300)
+        ai.choose_move(SOSGameLogic(4, "general"))
+        self.assertGreater(ai.tt.hits, 0)
+        self.assertGreater(ai.tt.stats()["used"], 0)
+
+class TestBoardWidget(unittest.TestCase):
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.game = SOSGameLogic(4, "general")
+        self.widget = SOSBoardWidget(self.game)
+
+    def test_sync_tracks_line_owners(self):
+        """Lines should be drawn in the colour of the player who made them."""
+        for move in [(0, 0, "S"), (0, 1, "O"), (0, 2, "S")]:
+            self.game.make_move(*move)
+        self.widget.sync()
+        self.assertEqual(self.widget._events, [(2, "Blue", ((0, 0), (0, 1), (0, 2)))])
+
+        self.game.pop_move()
+        self.widget.sync()
+        self.assertEqual(self.widget._events, [])
+        self.assertEqual(len(self.widget._drawn), 2)
+
+class TestReplaySeek(unittest.TestCase):
+    def setUp(self):
+        self.replay = SOSReplay()
+        self.replay.load_log(Path(__file__).parent / "logs" / "2.sos.json")
+        self.logic = self.replay.logic
+
+    def test_seek_matches_sequential_play(self):
+        """Jumping to a move should give the same state as playing up to it."""
+        self.replay.seek(len(self.replay.moves))
+        self.replay.seek(3)
+        expected = SOSGameLogic(self.logic.size, self.logic.mode)
+        for r, c, letter, _ in self.replay.moves[:3]:
+            expected.make_move(r, c, letter)
+        self.assertEqual(self.logic.board, expected.board)
+        self.assertEqual(self.logic.current_player, expected.current_player)
+        self.assertEqual(self.logic.sos_lines, expected.sos_lines)
+
+    def test_step_back_and_clamp(self):
+        self.assertFalse(self.replay.step_back())
+        self.assertTrue(self.replay.step_forward())
+        self.assertTrue(self.replay.step_back())
+        self.assertEqual(self.logic.empty_count, self.logic.size ** 2)
+        self.replay.seek(10_000)
+        self.assertEqual(self.replay.position, len(self.replay.moves))
+
+    def test_archive_game_picker(self):
+        """A multi-game archive asks which game to replay; a single game does not."""
+        moves = [(0, 0, "S", "Blue"), (1, 1, "O", "Red")]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "games.sosb")
+            with BinaryLogWriter(path) as archive:
+                archive.write_game(3, "simple", moves[:1])
+            with patch("sosGui.QInputDialog.getInt") as ask:
+                self.assertEqual(SOSGame.pick_archive_game(None, path), 0)
+                ask.assert_not_called()
+            with BinaryLogWriter(path) as archive:
+                archive.write_game(3, "simple", moves)
+            with patch("sosGui.QInputDialog.getInt", return_value=(2, True)):
+                game = SOSGame.pick_archive_game(None, path)
+            with patch("sosGui.QInputDialog.getInt", return_value=(1, False)):
+                self.assertIsNone(SOSGame.pick_archive_game(None, path))
+            self.replay.load_log(path, game)
+        self.assertEqual(self.replay.moves, moves)
+
+class TestSelfPlay(unittest.TestCase):
+    def test_parse_spec(self):
+        self.assertEqual(sosSelfPlay.parse_spec("minimax:max_depth=2,time_budget_ms=50"),
+                         {"strategy": "minimax", "max_depth": 2, "time_budget_ms": 50})
+
+    def test_batch_counts_every_game(self):
+        """Inline batch play should finish every game and add up its results."""
+        stats = sosSelfPlay.run_batch(6, 4, "general", "random", "random",
+                                      swap=True, workers=1, seed=3)
+        self.assertEqual(stats["games"], 6)
+        self.assertEqual(stats["wins"] + stats["draws"] + stats["losses"], 6)
+        self.assertEqual(stats["avg_moves"], 16)
+
+class TestGameLog(unittest.TestCase):
+    def test_reads_legacy_json_log(self):
+        data = read_log(Path(__file__).parent / "logs" / "1.sos.json")
+        self.assertEqual((data["size"], data["mode"]), (3, "simple"))
+        self.assertEqual(data["moves"][0], (0, 0, "S", "Blue"))
+
+    def test_streamed_log_round_trip(self):
+        """A recorded game should be appended line by line and read back intact."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "game.sos.jsonl"
+            game = SOSGameLogic(3, "simple")
+            game.start_recording(path, fsync="move")
+            game.make_move(0, 0, "S")
+            game.make_move(1, 1, "O")
+            self.assertEqual(len(path.read_text().splitlines()), 3)
+            self.assertEqual(game.make_move(2, 2, "S"), "blue_wins")
+
+            data = read_log(path)
+            self.assertEqual(data["moves"], [(0, 0, "S", "Blue"), (1, 1, "O", "Red"),
+                                             (2, 2, "S", "Blue")])
+            self.assertIsNone(game._record_log)
+            self.assertFalse(data["truncated"])
+
+            # a crash mid-append leaves half a record behind
+            path.write_text(path.read_text()[:-10])
+            data = read_log(path)
+            self.assertEqual(len(data["moves"]), 2)
+            self.assertTrue(data["truncated"])
+
+    def test_binary_archive_round_trip(self):
+        """Games packed into one binary archive should read back in order."""
+        small = [(0, 0, "S", "Blue"), (2, 1, "O", "Red")]
+        large = [(19, 19, "O", "Red"), (0, 7, "S", "Blue")]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "games.sosb"
+            with BinaryLogWriter(path) as writer:
+                writer.write_game(3, "simple", small)
+            with BinaryLogWriter(path) as writer:
+                writer.write_game(20, "general", large)
+
+            # header (5) + 2 games * game header (8) + 2 one-byte + 2 two-byte moves
+            self.assertEqual(path.stat().st_size, 5 + 16 + 2 + 4)
+            with BinaryLogReader(path) as reader:
+                self.assertEqual(len(reader), 2)
+                self.assertEqual(reader[0], {"size": 3, "mode": "simple", "moves": small})
+                self.assertEqual(reader[1]["moves"], large)
+            self.assertEqual(read_log(path, game=1)["mode"], "general")
+
+            path.write_bytes(path.read_bytes()[:-5])
+            with self.assertRaisesRegex(ValueError, "truncated"):
+                BinaryLogReader(path)
+            path.write_bytes(b"")
+            with self.assertRaisesRegex(ValueError, "truncated"):
+                BinaryLogReader(path)
+
+class TestBench(unittest.TestCase):
+    def test_suite_covers_hot_paths(self):
+        results = sosBench.bench_suite(sizes=[3], repeat=1)
+        self.assertEqual(set(results), {"make_move/3", "check_sos/3", "is_board_full/3",
+                                        "choose_move/3", "playout/3", "log_jsonl/3",
+                                        "log_binary/3"})
+        self.assertTrue(all(seconds > 0 for seconds in results.values()))
+
+    def test_compare_flags_slowdowns(self):
+        rows = sosBench.compare({"make_move/3": 1.0, "check_sos/3": 1.0},
+                                {"make_move/3": 1.2, "check_sos/3": 1.5}, tolerance=0.25)
+        self.assertEqual([(row["name"], row["slower"]) for row in rows],
+                         [("check_sos/3", True), ("make_move/3", False)])
+
+class TestServer(unittest.TestCase):
+    async def _exchange(self, port, lines):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write("".join(line + "\n" for line in lines).encode())
+        writer.write_eof()
+        replies = (await reader.read()).decode().splitlines()
+        writer.close()
+        await writer.wait_closed()
+        return replies
+
+    def test_protocol_and_load(self):
+        """Games on a live socket, with the computer side played by the server."""
+        async def scenario():
+            server = sosServer.GameServer()
+            listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                replies = await self._exchange(port, ["NEW 3 simple human random:seed=1",
+                                                      "MOVE 999 0 0 S"])
+                self.assertRegex(replies[0], r"^OK \d+ Blue$")
+                self.assertEqual(replies[1], "ERR 999 unknown game")
+                stats = await sosServer.load_test(port=port, sessions=30, connections=3,
+                                                  size=4, red="random")
+                while server.clients:
+                    await asyncio.sleep(0.01)
+            return stats
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["sessions"], 30)
+        self.assertGreater(stats["moves"], 30)
+        self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+
+    def test_pipelined_commands_answer_in_order(self):
+        """BOARD and CLOSE sent behind a MOVE wait for the computer's reply to it."""
+        async def scenario():
+            server = sosServer.GameServer()
+            listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                return await self._exchange(port, ["NEW 3 general human random:seed=1",
+                                                   "MOVE 1 1 1 O", "BOARD 1", "CLOSE 1"])
+
+        replies = asyncio.run(scenario())
+        self.assertEqual(replies[:2], ["OK 1 Blue", "MOVED 1 1 1 O Blue continue"])
+        self.assertRegex(replies[2], r"^MOVED 1 \d \d [SO] Red continue$")
+        self.assertEqual(replies[3], "OK 1 Blue")
+        self.assertRegex(replies[4], r"^BOARD 1 3 ")
+        self.assertEqual(replies[4].count("-"), 7)
+        self.assertEqual(replies[5:], ["OK 1 Blue", "OK 1 closed"])
+
+    def test_session_commands(self):
+        async def scenario():
+            server = sosServer.GameServer()
+            owned = set()
+            new = await server.dispatch(["NEW", "3", "simple"], owned)
+            game = new[-1].split()[1]
+            moved = await server.dispatch(["MOVE", game, "1", "1", "O"], owned)
+            board = await server.dispatch(["BOARD", game], owned)
+            with self.assertRaises(ValueError):
+                await server.dispatch(["MOVE", game, "1", "1", "S"], owned)
+            with self.assertRaises(ValueError):
+                await server.dispatch(["NEW", "3", "simple", "human", "minimax:foo=1"], owned)
+            closed = await server.dispatch(["CLOSE", game], owned)
+            return game, moved, board, closed, server.sessions
+
+        game, moved, board, closed, sessions = asyncio.run(scenario())
+        self.assertEqual(moved, [f"MOVED {game} 1 1 O Blue continue", f"OK {game} Red"])
+        self.assertEqual(board[0], f"BOARD {game} 3 ---/-O-/---")
+        self.assertEqual(closed, [f"OK {game} closed"])
+        self.assertEqual(sessions, {})
+
+class TestAnalytics(unittest.TestCase):
+    def test_groups_logs_and_archives(self):
+        """Loose logs and archived games should both be replayed and grouped."""
+        with tempfile.TemporaryDirectory() as tmp:
+            sosSelfPlay.run_batch(4, 3, "simple", "random", "random", workers=1, seed=1,
+                                  record_dir=tmp, record_bin=str(Path(tmp) / "games.sosb"))
+            sosSelfPlay.run_batch(2, 4, "general", "random", "random", workers=1, seed=2,
+                                  record_dir=str(Path(tmp) / "general"))
+            stats = sosAnalytics.analyze(tmp, workers=1)
+            (Path(tmp) / "broken.sosb").write_bytes(b"")
+            with_broken = sosAnalytics.analyze(tmp, workers=1)
+
+        self.assertEqual(stats["errors"], [])
+        self.assertEqual(len(with_broken["errors"]), 1)
+        self.assertEqual(with_broken["groups"], stats["groups"])
+        simple, general = stats["groups"]
+        self.assertEqual((simple["size"], simple["mode"], simple["games"]), (3, "simple", 8))
+        self.assertEqual(simple["blue_wins"] + simple["red_wins"] + simple["draws"], 8)
+        self.assertEqual((general["games"], general["avg_moves"]), (2, 16))
+        self.assertIn("avg_sos", sosAnalytics.to_csv(stats["groups"]).splitlines()[0])
+
+    def test_archive_opened_once_per_chunk(self):
+        """Reader opens grow with the game count divided by ARCHIVE_CHUNK, not per game."""
+        opens = []
+
+        class CountingReader(BinaryLogReader):
+            def __init__(self, path):
+                opens.append(path)
+                super().__init__(path)
+
+        moves = [(0, 0, "S", "Blue"), (0, 1, "O", "Red"), (0, 2, "S", "Blue")]
+        chunk = sosAnalytics.ARCHIVE_CHUNK
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(sosAnalytics, "BinaryLogReader", CountingReader):
+            for games in (2 * chunk, 4 * chunk):
+                # the writer appends: top the archive up to <games>
+                with BinaryLogWriter(Path(tmp) / "games.sosb") as archive:
+                    for _ in range(2 * chunk):
+                        archive.write_game(3, "simple", moves)
+                opens.clear()
+                stats = sosAnalytics.analyze(tmp, workers=1)
+                self.assertEqual(stats["groups"][0]["games"], games)
+                # one open to index the archive, then one per task
+                self.assertEqual(len(opens), 1 + games // chunk)
+
+class TestSymmetry(unittest.TestCase):
+    MOVES = [(0, 0, "S", "Blue"), (1, 2, "O", "Red"), (3, 1, "S", "Blue")]
+
+    def test_symmetric_positions_share_canonical_key(self):
+        keys = set()
+        for symmetry in range(8):
+            logic = SOSGameLogic(size=4, mode="general")
+            for row, col, letter, _ in self.MOVES:
+                logic.make_move(*transform_move(4, symmetry, row, col), letter)
+            keys.add(logic.canonical_zobrist)
+        self.assertEqual(len(keys), 1)
+
+    def test_canonical_moves(self):
+        mirrored = [(r, 3 - c, letter, player) for r, c, letter, player in self.MOVES]
+        self.assertEqual(canonical_moves(4, mirrored), canonical_moves(4, self.MOVES))
+        self.assertNotEqual(canonical_moves(4, self.MOVES[:2]), canonical_moves(4, self.MOVES))
+
+class TestTablebase(unittest.TestCase):
+    def test_table_matches_full_search(self):
+        """Stored 3x3 values should equal a full-depth minimax after a save/load round trip."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "3-general.sost"
+            sosBook.build(3, "general").save(path)
+            table = sosBook.Tablebase.load(path)
+
+        rng = random.Random(4)
+        for _ in range(20):
+            logic = SOSGameLogic(size=3, mode="general")
+            for row, col, letter in rng.sample([(r, c, l) for r in range(3) for c in range(3)
+                                                for l in "SO"], 12)[:rng.randrange(6)]:
+                if logic.is_valid_move(row, col):
+                    logic.make_move(row, col, letter)
+            ai = ComputerPlayer(player_color=logic.current_player, time_budget_ms=10 ** 6)
+            value, _ = ai.minimax(logic, logic.empty_count, float("-inf"), float("inf"))
+            self.assertEqual(table.value(logic), value)
+
+    def test_choose_move_uses_book(self):
+        logic = SOSGameLogic(size=3, mode="simple")
+        logic.make_move(0, 0, "S")
+        logic.make_move(0, 1, "O")
+        ai = ComputerPlayer(player_color="Blue", max_depth=1, book=sosBook.build(3, "simple"))
+        self.assertEqual(ai.choose_move(logic), (0, 2, "S"))
+        self.assertIsNone(ai.book.best_move(SOSGameLogic(size=4, mode="simple")))
+
+@unittest.skipIf(sosBatch.np is None, "NumPy not installed")
+class TestBatchEvaluate(unittest.TestCase):
+    def test_matches_game_logic(self):
+        """Batch counts should agree with the engine's own lines and threat tracking."""
+        rng = random.Random(11)
+        games = []
+        for _ in range(20):
+            logic = SOSGameLogic(size=6, mode="general")
+            cells = [(r, c) for r in range(6) for c in range(6)]
+            rng.shuffle(cells)
+            for row, col in cells[:rng.randrange(36)]:
+                logic.push_move(row, col, rng.choice("SO"))
+            games.append(logic)
+
+        stats = sosBatch.batch_evaluate(sosBatch.encode_boards(g.board for g in games))
+        for i, logic in enumerate(games):
+            empty = [r * 6 + c for r in range(6) for c in range(6) if logic.board[r][c] == "-"]
+            self.assertEqual(stats["sos"][i], len(logic.sos_lines))
+            self.assertEqual(stats["threat_s"][i], sum(1 for j in empty if logic._threat_s[j]))
+            self.assertEqual(stats["threat_o"][i], sum(1 for j in empty if logic._threat_o[j]))
+            self.assertEqual(stats["threats"][i], logic.threat_count)
+
+class TestPlayout(unittest.TestCase):
+    def test_open_sos_decides_simple_playouts(self):
+        """The side to move completes an open SOS, so every Simple playout is its win."""
+        logic = SOSGameLogic(size=5, mode="simple")
+        for move in [(0, 0, "S"), (4, 4, "O"), (0, 2, "S"), (4, 0, "O")]:
+            logic.make_move(*move)
+        results = sosPlayout.playout_stats(logic, 50, seed=3)
+        self.assertEqual(results, {"Blue": 50, "Red": 0, "draw": 0})
+
+    def test_batches_split_across_workers(self):
+        logic = SOSGameLogic(size=6, mode="general")
+        results = sosPlayout.playout_stats(logic, 41, workers=2, seed=5)
+        self.assertEqual(sum(results.values()), 41)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
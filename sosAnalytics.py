@@ -0,0 +1,182 @@
+"""Aggregate statistics over a directory of game logs.
+
+    python -m sosAnalytics logs/ --format csv --out stats.csv
+
+Every JSON, JSON Lines and binary-archive log under the directory is
+replayed through SOSGameLogic without the GUI on a process pool, and the
+results are grouped by board size and mode: games played, win rates,
+draws, unfinished games and average move and SOS counts. With --dedup,
+games that repeat an earlier one up to rotation or reflection of the
+board are counted once.
+"""
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import io
+import json
+import struct
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sosGameLogic import canonical_moves, make_game_logic
+from sosLog import BinaryLogReader, read_log
+
+LOG_PATTERNS = ("*.sos.json", "*.sos.jsonl", "*.sosb")
+ARCHIVE_CHUNK = 256     # archive games replayed per task, from one open reader
+FIELDS = ("size", "mode", "games", "blue_wins", "red_wins", "draws", "unfinished",
+          "blue_win_rate", "red_win_rate", "draw_rate", "avg_moves", "avg_sos")
+
+# (path, range of archive games or None, dedup, error reading the archive or None)
+Task = Tuple[str, Optional[Tuple[int, int]], bool, Optional[str]]
+
+
+def iter_tasks(root: str | Path, dedup: bool = False,
+               chunk: int = ARCHIVE_CHUNK) -> Iterator[Task]:
+    """Tasks covering every game found under <root>, in a stable order.
+
+    A log file is one task; an archive is split into ranges of <chunk>
+    games so each task opens it once. An archive that cannot be indexed
+    becomes a single task carrying the error.
+    """
+    paths = sorted({p for pattern in LOG_PATTERNS for p in Path(root).rglob(pattern)})
+    for path in paths:
+        if path.suffix == ".sosb":
+            try:
+                with BinaryLogReader(path) as reader:
+                    count = len(reader)
+            except (OSError, ValueError, struct.error) as exc:
+                yield str(path), None, dedup, f"{path}: {exc}"
+                continue
+            for start in range(0, count, chunk):
+                yield str(path), (start, min(start + chunk, count)), dedup, None
+        else:
+            yield str(path), None, dedup, None
+
+
+def replay(data: Dict, canonical: bool = False) -> Dict:
+    """Drive SOSGameLogic through a loaded log and summarize the outcome.
+
+    With <canonical> the summary also carries a hash of the game that is
+    shared by its rotations and reflections.
+    """
+    logic = make_game_logic(data["size"], data["mode"])
+    result = "continue"
+    for row, col, letter, _ in data["moves"]:
+        if result != "continue":
+            break
+        result = logic.make_move(row, col, letter)
+    summary = {
+        "size": data["size"],
+        "mode": data["mode"],
+        "result": result,
+        "moves": len(logic._history),
+        "sos_count": len(logic.sos_lines),
+    }
+    if canonical:
+        key = (data["size"], data["mode"], canonical_moves(data["size"], data["moves"]))
+        summary["canonical"] = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+    return summary
+
+
+def _analyze_task(task: Task) -> List[Dict]:
+    path, games, dedup, error = task
+    if error is not None:
+        return [{"error": error}]
+    try:
+        if games is None:
+            return [replay(read_log(path), canonical=dedup)]
+        with BinaryLogReader(path) as reader:
+            return [replay(reader[index], canonical=dedup) for index in range(*games)]
+    except (OSError, ValueError, KeyError, struct.error) as exc:
+        return [{"error": f"{path}: {exc}"}]
+
+
+def analyze(root: str | Path, workers: Optional[int] = None,
+            chunksize: int = 16, dedup: bool = False) -> Dict:
+    """Replay every log under <root> and return {"groups", "errors", "duplicates"}.
+
+    workers=1 replays inline; otherwise games are spread over a Pool. With
+    dedup, games equal to an earlier one under a board symmetry are skipped.
+    """
+    groups: Dict[Tuple[int, str], Dict] = {}
+    errors: List[str] = []
+    seen = set()
+    duplicates = 0
+    tasks = iter_tasks(root, dedup)
+    pool = Pool(workers) if workers != 1 else None
+    try:
+        results = (pool.imap_unordered(_analyze_task, tasks, chunksize) if pool
+                   else map(_analyze_task, tasks))
+        for game in (game for batch in results for game in batch):
+            if "error" in game:
+                errors.append(game["error"])
+                continue
+            if dedup:
+                if game["canonical"] in seen:
+                    duplicates += 1
+                    continue
+                seen.add(game["canonical"])
+            group = groups.setdefault((game["size"], game["mode"]), {
+                "size": game["size"], "mode": game["mode"], "games": 0,
+                "blue_wins": 0, "red_wins": 0, "draws": 0, "unfinished": 0,
+                "moves": 0, "sos": 0,
+            })
+            group["games"] += 1
+            group["moves"] += game["moves"]
+            group["sos"] += game["sos_count"]
+            key = {"blue_wins": "blue_wins", "red_wins": "red_wins",
+                   "draw": "draws"}.get(game["result"], "unfinished")
+            group[key] += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return {"groups": [_finish(groups[key]) for key in sorted(groups)], "errors": errors,
+            "duplicates": duplicates}
+
+
+def _finish(group: Dict) -> Dict:
+    games = group["games"]
+    row = {field: group[field] for field in FIELDS[:7]}
+    row["blue_win_rate"] = group["blue_wins"] / games
+    row["red_win_rate"] = group["red_wins"] / games
+    row["draw_rate"] = group["draws"] / games
+    row["avg_moves"] = group["moves"] / games
+    row["avg_sos"] = group["sos"] / games
+    return row
+
+
+def to_csv(groups: List[Dict]) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDS, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(groups)
+    return out.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate statistics over SOS game logs.")
+    parser.add_argument("root", nargs="?", default="logs", help="directory of logs")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    parser.add_argument("--out", default=None, help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process count (default: one per CPU, 1 runs inline)")
+    parser.add_argument("--dedup", action="store_true",
+                        help="count games that are symmetric copies of another only once")
+    args = parser.parse_args(argv)
+
+    stats = analyze(args.root, workers=args.workers, dedup=args.dedup)
+    text = to_csv(stats["groups"]) if args.format == "csv" else json.dumps(stats, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text if text.endswith("\n") else text + "\n")
+    for error in stats["errors"]:
+        print(f"skipped {error}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
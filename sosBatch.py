@@ -0,0 +1,83 @@
+"""Vectorized evaluation of many SOS boards at once.
+
+Boards are stacked into a (B, n, n) integer array using EMPTY/S/O codes
+(see encode_boards). batch_evaluate compares shifted views of that array
+along the four line directions, so the work per board is a handful of
+whole-array operations instead of a Python loop per cell.
+
+NumPy is optional: the rest of the game runs without it, and only this
+module needs it.
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, Sequence
+
+try:
+    import numpy as np
+except ImportError:     # pragma: no cover - exercised only without numpy
+    np = None
+
+EMPTY, S, O = 0, 1, 2
+
+# (dr, dc) for horizontal, vertical, diagonal and anti-diagonal lines
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("sosBatch needs NumPy: pip install numpy")
+
+
+def encode_boards(boards: Iterable[Sequence[Sequence[str]]]):
+    """Stack SOSGameLogic-style boards ('-', 'S', 'O' lists) into a (B, n, n) uint8 array."""
+    _require_numpy()
+    letters = np.asarray(list(boards), dtype="<U1")
+    return ((letters == "S") * S + (letters == "O") * O).astype(np.uint8)
+
+
+def _window(n: int, d: int, k: int) -> slice:
+    """Slice along one axis selecting the k-th cell of every line with step d."""
+    return slice(max(0, -2 * d) + k * d, n - max(0, 2 * d) + k * d)
+
+
+def batch_evaluate(boards) -> Dict[str, "np.ndarray"]:
+    """Count completed SOS lines and open threats for each board in a batch.
+
+    <boards> is a (B, n, n) array of EMPTY/S/O codes (or letters, which are
+    encoded first). Returns int arrays of length B:
+
+        sos        completed S-O-S lines
+        threat_s   empty cells where an S would complete at least one SOS
+        threat_o   empty cells where an O would complete at least one SOS
+        threats    empty cells where either letter completes an SOS,
+                   matching SOSGameLogic.threat_count
+    """
+    _require_numpy()
+    boards = np.asarray(boards)
+    if boards.dtype.kind == "U":
+        boards = encode_boards(boards)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+        raise ValueError(f"expected a (B, n, n) array, got shape {boards.shape}")
+
+    count, n = boards.shape[0], boards.shape[1]
+    sos = np.zeros(count, dtype=np.int64)
+    s_cells = np.zeros(boards.shape, dtype=bool)
+    o_cells = np.zeros(boards.shape, dtype=bool)
+
+    is_s = boards == S
+    is_o = boards == O
+    is_empty = boards == EMPTY
+    for dr, dc in (_DIRECTIONS if n >= 3 else ()):
+        cells = [(slice(None), _window(n, dr, k), _window(n, dc, k)) for k in range(3)]
+        first, middle, last = cells
+        sos += (is_s[first] & is_o[middle] & is_s[last]).sum(axis=(1, 2))
+        # _OS and SO_ are completed by an S, S_S by an O
+        s_cells[first] |= is_empty[first] & is_o[middle] & is_s[last]
+        s_cells[last] |= is_s[first] & is_o[middle] & is_empty[last]
+        o_cells[middle] |= is_s[first] & is_empty[middle] & is_s[last]
+
+    return {
+        "sos": sos,
+        "threat_s": s_cells.sum(axis=(1, 2)),
+        "threat_o": o_cells.sum(axis=(1, 2)),
+        "threats": (s_cells | o_cells).sum(axis=(1, 2)),
+    }
@@ -0,0 +1,298 @@
+"""Headless benchmarks for the SOS engine.
+
+    python -m sosBench suite --save baseline.json
+    python -m sosBench suite --baseline baseline.json --tolerance 0.25
+    python -m sosBench compare baseline.json current.json
+    python -m sosBench parallel --sizes 8 12 20 --workers 1 2 4 8
+    python -m sosBench ordering --sizes 8 12 20 --depth 3
+
+``suite`` times the engine hot paths (make_move, check_sos, is_board_full,
+choose_move, sosPlayout playouts and log writing) on seeded boards from
+3x3 to 20x20 and reports seconds per call, the best of several repeats.
+Given a baseline it exits with status 1 when any benchmark is more than
+--tolerance slower.
+
+``parallel`` times a fixed-depth ComputerPlayer search of one seeded
+mid-game position per board size with each worker count and prints the
+speedup over a single process. ComputerPlayer searches inline on a
+single CPU, so the curve is only meaningful on a multi-core machine.
+``ordering`` searches the same positions
+with move ordering off, on, and on with pruning, and reports nodes per
+second and the share of searched nodes that ended in a beta cutoff.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sosGameLogic import SOSGameLogic, ComputerPlayer
+from sosLog import BinaryLogWriter, JsonlLogWriter
+from sosPlayout import encode, run_playouts
+
+SUITE_SIZES = (3, 5, 8, 12, 20)
+
+
+def seeded_position(size: int, mode: str = "general", fill: float = 0.25,
+                    seed: int = 0) -> SOSGameLogic:
+    """A reproducible position with roughly <fill> of the board occupied."""
+    rng = random.Random(seed * 1000 + size)
+    game = SOSGameLogic(size, mode)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    for row, col in cells[:int(size * size * fill)]:
+        game.push_move(row, col, rng.choice("SO"))
+    return game
+
+
+def seeded_game(size: int, mode: str = "general", seed: int = 0) -> List:
+    """A reproducible full game as (row, col, letter, player) moves."""
+    rng = random.Random(seed * 1000 + size)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    game = SOSGameLogic(size, mode)
+    moves = []
+    for row, col in cells:
+        letter = rng.choice("SO")
+        moves.append((row, col, letter, game.current_player))
+        if game.make_move(row, col, letter) != "continue":
+            break
+    return moves
+
+
+def _best_time(run: Callable[[], int], repeat: int) -> float:
+    """Seconds per operation: <run> returns how many operations it did; best of <repeat>."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = run()
+        best = min(best, (time.perf_counter() - start) / ops)
+    return best
+
+
+def bench_suite(sizes=SUITE_SIZES, mode: str = "general", seed: int = 0,
+                repeat: int = 5, depth: int = 2) -> Dict[str, float]:
+    """Seconds per call of each hot path, keyed "<benchmark>/<size>"."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="sosBench") as tmp_dir:
+        tmp = Path(tmp_dir)
+        for size in sizes:
+            moves = seeded_game(size, mode, seed)
+
+            def make_moves():
+                game = SOSGameLogic(size, mode)
+                for row, col, letter, _ in moves:
+                    game.make_move(row, col, letter)
+                return len(moves)
+
+            filled = SOSGameLogic(size, mode)
+            for row, col, letter, _ in moves:
+                filled.push_move(row, col, letter)
+
+            def check_all():
+                for row in range(size):
+                    for col in range(size):
+                        filled.check_sos(row, col)
+                return size * size
+
+            def board_full():
+                for _ in range(10000):
+                    filled.is_board_full()
+                return 10000
+
+            position = seeded_position(size, mode, seed=seed)
+
+            def choose():
+                ComputerPlayer(player_color=position.current_player, max_depth=depth,
+                               time_budget_ms=10 ** 9).choose_move(position)
+                return 1
+
+            def playouts():
+                board, blue_to_move, margin = encode(position)
+                run_playouts(bytes(board), size, mode, blue_to_move, margin, 100, seed)
+                return 100
+
+            def write_jsonl():
+                log = JsonlLogWriter(tmp / "bench.sos.jsonl", size, mode, fsync="never")
+                for move in moves:
+                    log.append(*move)
+                log.close()
+                return len(moves)
+
+            def write_binary():
+                path = tmp / "bench.sosb"
+                path.unlink(missing_ok=True)
+                with BinaryLogWriter(path) as archive:
+                    for _ in range(100):
+                        archive.write_game(size, mode, moves)
+                return 100
+
+            for name, run in (("make_move", make_moves), ("check_sos", check_all),
+                              ("is_board_full", board_full), ("choose_move", choose),
+                              ("playout", playouts),
+                              ("log_jsonl", write_jsonl), ("log_binary", write_binary)):
+                results[f"{name}/{size}"] = _best_time(run, repeat)
+    return results
+
+
+def compare(baseline: Dict[str, float], current: Dict[str, float],
+            tolerance: float = 0.25) -> List[Dict]:
+    """Per-benchmark ratio current / baseline; "slower" marks ratios above 1 + tolerance."""
+    rows = []
+    for name in sorted(baseline.keys() & current.keys(), key=_suite_order):
+        ratio = current[name] / baseline[name]
+        rows.append({"name": name, "baseline": baseline[name], "current": current[name],
+                     "ratio": ratio, "slower": ratio > 1 + tolerance})
+    return rows
+
+
+def _suite_order(name: str):
+    bench, _, size = name.partition("/")
+    return bench, int(size)
+
+
+def _load_results(path: str) -> Dict[str, float]:
+    with open(path, encoding="utf-8") as fp:
+        return json.load(fp)["results"]
+
+
+def _print_comparison(rows: List[Dict]) -> bool:
+    """Print a comparison table and return True if nothing got slower."""
+    print(f"{'benchmark':>20} {'baseline':>11} {'current':>11} {'ratio':>7}")
+    for row in rows:
+        flag = "  SLOWER" if row["slower"] else ""
+        print(f"{row['name']:>20} {row['baseline'] * 1e6:>9.2f}us {row['current'] * 1e6:>9.2f}us "
+              f"{row['ratio']:>6.2f}x{flag}")
+    return not any(row["slower"] for row in rows)
+
+
+def bench_parallel(sizes: List[int], workers: List[int], depth: int,
+                   mode: str = "general", seed: int = 0) -> List[Dict]:
+    """Time a depth-<depth> search per size and worker count."""
+    rows = []
+    for size in sizes:
+        game = seeded_position(size, mode, seed=seed)
+        baseline = None
+        for count in workers:
+            ai = ComputerPlayer(player_color=game.current_player, max_depth=depth,
+                                time_budget_ms=10 ** 9, workers=count)
+            if count > 1:
+                # start the pool outside the timed region
+                ai.choose_move(seeded_position(3, mode, fill=0.5, seed=seed))
+            start = time.perf_counter()
+            ai.choose_move(game)
+            seconds = time.perf_counter() - start
+            ai.close()
+            baseline = baseline or seconds
+            rows.append({"size": size, "workers": count, "depth": depth,
+                         "seconds": seconds, "speedup": baseline / seconds})
+    return rows
+
+
+ORDERING_VARIANTS = (
+    ("row-major", {"ordering": False, "prune": False}),
+    ("ordered", {"ordering": True, "prune": False}),
+    ("ordered+prune", {"ordering": True, "prune": True}),
+)
+
+
+def bench_ordering(sizes: List[int], depth: int, mode: str = "general",
+                   seed: int = 0) -> List[Dict]:
+    """Nodes, speed and cutoff rate of a depth-<depth> search per move-ordering variant."""
+    rows = []
+    for size in sizes:
+        game = seeded_position(size, mode, seed=seed)
+        for name, options in ORDERING_VARIANTS:
+            ai = ComputerPlayer(player_color=game.current_player, max_depth=depth,
+                                time_budget_ms=10 ** 9, **options)
+            result = ai.search(game)
+            rows.append({"size": size, "variant": name, "depth": depth, "move": result.move,
+                         "nodes": result.nodes, "seconds": result.elapsed,
+                         "nps": result.nps, "cutoff_rate": result.cutoff_rate})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SOS engine benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parallel = commands.add_parser("parallel", help="root-parallel search speedup curve")
+    parallel.add_argument("--sizes", type=int, nargs="+", default=[8, 12, 20])
+    parallel.add_argument("--workers", type=int, nargs="+",
+                          default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parallel.add_argument("--depth", type=int, default=3)
+    parallel.add_argument("--mode", choices=("simple", "general"), default="general")
+    parallel.add_argument("--seed", type=int, default=0)
+    parallel.add_argument("--save", default=None, help="write the results as JSON")
+
+    ordering = commands.add_parser("ordering", help="move ordering and pruning effect")
+    ordering.add_argument("--sizes", type=int, nargs="+", default=[8, 12, 20])
+    ordering.add_argument("--depth", type=int, default=3)
+    ordering.add_argument("--mode", choices=("simple", "general"), default="general")
+    ordering.add_argument("--seed", type=int, default=0)
+    ordering.add_argument("--save", default=None, help="write the results as JSON")
+
+    suite = commands.add_parser("suite", help="time the engine hot paths")
+    suite.add_argument("--sizes", type=int, nargs="+", default=list(SUITE_SIZES))
+    suite.add_argument("--mode", choices=("simple", "general"), default="general")
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--repeat", type=int, default=5)
+    suite.add_argument("--save", default=None, help="write the results as JSON")
+    suite.add_argument("--baseline", default=None, help="results JSON to compare against")
+    suite.add_argument("--tolerance", type=float, default=0.25,
+                       help="allowed slowdown before failing (0.25 = 25%%)")
+
+    compare_cmd = commands.add_parser("compare", help="compare two saved suite results")
+    compare_cmd.add_argument("baseline")
+    compare_cmd.add_argument("current")
+    compare_cmd.add_argument("--tolerance", type=float, default=0.25)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        rows = compare(_load_results(args.baseline), _load_results(args.current), args.tolerance)
+        if not _print_comparison(rows):
+            sys.exit(1)
+        return
+    if args.command == "suite":
+        results = bench_suite(args.sizes, args.mode, args.seed, args.repeat)
+        rows = {
+            "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                     "mode": args.mode, "seed": args.seed, "repeat": args.repeat},
+            "results": results,
+        }
+        if args.baseline:
+            ok = _print_comparison(compare(_load_results(args.baseline), results,
+                                           args.tolerance))
+        else:
+            ok = True
+            for name in sorted(results, key=_suite_order):
+                print(f"{name:>20} {results[name] * 1e6:>11.2f}us")
+    elif args.command == "ordering":
+        rows = bench_ordering(args.sizes, args.depth, args.mode, args.seed)
+        print(f"{'size':>5} {'variant':>14} {'nodes':>9} {'seconds':>9} {'nodes/s':>9} {'cutoffs':>8}")
+        for row in rows:
+            print(f"{row['size']:>5} {row['variant']:>14} {row['nodes']:>9} "
+                  f"{row['seconds']:>9.3f} {row['nps']:>9.0f} {row['cutoff_rate']:>7.1%}")
+    elif args.command == "parallel":
+        if (os.cpu_count() or 1) == 1:
+            print("only one CPU: every worker count searches inline", file=sys.stderr)
+        rows = bench_parallel(args.sizes, args.workers, args.depth, args.mode, args.seed)
+        print(f"{'size':>5} {'workers':>8} {'seconds':>9} {'speedup':>8}")
+        for row in rows:
+            print(f"{row['size']:>5} {row['workers']:>8} {row['seconds']:>9.3f} "
+                  f"{row['speedup']:>7.2f}x")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump(rows, fp, indent=2)
+    if args.command == "suite" and not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Exact position tables for small boards.
+
+    python -m sosBook build --size 3 --mode general --out 3-general.sost
+    python -m sosBook build --size 4 --mode simple --max-empty 10 --games 500 \\
+        --out 4-simple.sost
+
+A table maps SOSGameLogic.canonical_zobrist keys, which are shared by the
+up to 8 rotations and reflections of a position, to the exact value
+for the side to move. In General mode that is SOS lines still to be
+gained minus those the opponent gains, as a full-depth
+ComputerPlayer.minimax scores it. In Simple mode it is just +1 / 0 / -1
+for win / draw / loss, not minimax's +/-(WIN_SCORE + depth).
+
+3x3 boards are solved from the empty board. Larger boards have far too
+many positions to solve exhaustively in Python, so --max-empty builds an
+endgame table instead: seeded random games are played down to that many
+empty cells and every position below each of those is solved.
+
+On disk a table is a header, the sorted 64-bit keys and one signed byte
+per value:
+
+    b"SOST" + version (u8), size (u8), mode (u8), entry count (u32)
+"""
+from __future__ import annotations
+import argparse
+import random
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sosGameLogic import SOSGameLogic
+
+TABLE_MAGIC = b"SOST"
+TABLE_VERSION = 2
+_HEADER = struct.Struct("<4sBBBI")
+_MODES = ("simple", "general")
+
+
+class Tablebase:
+    """Read-only exact values for one board size and mode."""
+
+    def __init__(self, size: int, mode: str, keys: array, values: array):
+        self.size = size
+        self.mode = mode
+        self._keys = keys        # sorted array('Q')
+        self._values = values    # array('b'), parallel to _keys
+
+    @classmethod
+    def from_dict(cls, size: int, mode: str, table: Dict[int, int]) -> "Tablebase":
+        keys = array("Q", sorted(table))
+        values = array("b", (table[key] for key in keys))
+        return cls(size, mode, keys, values)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def value(self, game_logic) -> Optional[int]:
+        """Exact value of the position for the side to move, or None if not stored."""
+        if game_logic.size != self.size or game_logic.mode != self.mode:
+            return None
+        key = game_logic.canonical_zobrist
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._values[i]
+        return None
+
+    def best_move(self, game_logic) -> Optional[Tuple[int, int, str]]:
+        """A move that keeps the stored value, or None if the position is not covered."""
+        target = self.value(game_logic)
+        if target is None:
+            return None
+        for move in _empty_moves(game_logic):
+            value = _move_value(self, game_logic, move)
+            if value == target:
+                return move
+        return None
+
+    def save(self, path: str | Path) -> None:
+        keys, values = array("Q", self._keys), array("b", self._values)
+        if sys.byteorder == "big":
+            keys.byteswap()
+        with open(path, "wb") as fp:
+            fp.write(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, self.size,
+                                  _MODES.index(self.mode), len(keys)))
+            fp.write(keys.tobytes())
+            fp.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Tablebase":
+        data = Path(path).read_bytes()
+        magic, version, size, mode, count = _HEADER.unpack_from(data, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError("Unrecognised table format")
+        offset = _HEADER.size
+        keys = array("Q")
+        keys.frombytes(data[offset:offset + 8 * count])
+        if sys.byteorder == "big":
+            keys.byteswap()
+        values = array("b")
+        values.frombytes(data[offset + 8 * count:offset + 9 * count])
+        return cls(size, _MODES[mode], keys, values)
+
+
+def _empty_moves(game_logic):
+    board = game_logic.board
+    size = game_logic.size
+    return [(r, c, letter) for r in range(size) for c in range(size)
+            if board[r][c] == "-" for letter in "SO"]
+
+
+def _move_value(table, game_logic, move) -> Optional[int]:
+    """Exact value of <move> for the side to move, looked up through <table>."""
+    gained = game_logic.push_move(*move)
+    try:
+        if game_logic.mode == "simple":
+            if gained:
+                return 1
+            if game_logic.empty_count == 0:
+                return 0
+            rest = table.value(game_logic)
+            return None if rest is None else -rest
+        rest = 0 if game_logic.empty_count == 0 else table.value(game_logic)
+        if rest is None:
+            return None
+        return gained + rest if gained else -rest
+    finally:
+        game_logic.pop_move()
+
+
+class _Solver:
+    """Exhaustive negamax with a shared memo; every stored value is exact.
+
+    There is no pruning, not even after a winning move, so that every
+    reachable position below a solved root ends up in the table.
+    """
+
+    def __init__(self):
+        self.table: Dict[int, int] = {}
+
+    def solve(self, game_logic) -> int:
+        key = game_logic.canonical_zobrist
+        if key in self.table:
+            return self.table[key]
+        simple = game_logic.mode == "simple"
+        best = None
+        for move in _empty_moves(game_logic):
+            gained = game_logic.push_move(*move)
+            if simple and gained:
+                value = 1
+            elif game_logic.empty_count == 0:
+                value = gained
+            elif gained:
+                value = gained + self.solve(game_logic)
+            else:
+                value = -self.solve(game_logic)
+            game_logic.pop_move()
+            if best is None or value > best:
+                best = value
+        self.table[key] = best
+        return best
+
+
+def build(size: int, mode: str, max_empty: Optional[int] = None, games: int = 200,
+          seed: int = 0) -> Tablebase:
+    """Solve every position from the empty board, or endgames of <max_empty> cells."""
+    solver = _Solver()
+    if max_empty is None or max_empty >= size * size:
+        solver.solve(SOSGameLogic(size, mode))
+        return Tablebase.from_dict(size, mode, solver.table)
+
+    rng = random.Random(seed)
+    for _ in range(games):
+        logic = SOSGameLogic(size, mode)
+        over = False
+        while logic.empty_count > max_empty and not over:
+            row, col, letter = rng.choice(_empty_moves(logic))
+            over = logic.make_move(row, col, letter) != "continue"
+        if not over:
+            solver.solve(logic)
+    return Tablebase.from_dict(size, mode, solver.table)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build exact SOS position tables.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_cmd = commands.add_parser("build", help="solve positions and write a table")
+    build_cmd.add_argument("--size", type=int, required=True, choices=(3, 4, 5))
+    build_cmd.add_argument("--mode", choices=_MODES, required=True)
+    build_cmd.add_argument("--max-empty", type=int, default=None,
+                           help="solve endgames with this many empty cells (default: whole game)")
+    build_cmd.add_argument("--games", type=int, default=200,
+                           help="random games sampled for endgame positions")
+    build_cmd.add_argument("--seed", type=int, default=0)
+    build_cmd.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    table = build(args.size, args.mode, args.max_empty, args.games, args.seed)
+    table.save(args.out)
+    print(f"{len(table)} positions solved in {time.perf_counter() - start:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
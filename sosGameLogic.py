@@ -1,8 +1,133 @@
 from __future__ import annotations
-import json
+import cProfile
+import io
+import multiprocessing
+import os
+import pstats
+import queue
+import random
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from sosLog import JsonlLogWriter
+from sosMcts import MCTS
+
+# per-size cache: flat cell index -> tuple of (r0, c0, r1, c1, r2, c2, line_key)
+_TRIPLET_CACHE: Dict[int, List[Tuple]] = {}
+
+
+def _triplet_index(size: int) -> List[Tuple]:
+    """Return every in-bounds S-O-S triplet through each cell of a size x size board."""
+    index = _TRIPLET_CACHE.get(size)
+    if index is not None:
+        return index
+    cells = [[] for _ in range(size * size)]
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for r0 in range(size):
+            for c0 in range(size):
+                r2, c2 = r0 + 2*dr, c0 + 2*dc
+                if not (0 <= r2 < size and 0 <= c2 < size):
+                    continue
+                r1, c1 = r0 + dr, c0 + dc
+                # rows never decrease along these axes, so the key is already sorted
+                entry = (r0, c0, r1, c1, r2, c2, ((r0, c0), (r1, c1), (r2, c2)))
+                for r, c in ((r0, c0), (r1, c1), (r2, c2)):
+                    cells[r * size + c].append(entry)
+    index = [tuple(triplets) for triplets in cells]
+    _TRIPLET_CACHE[size] = index
+    return index
+
+
+# per-size cache: flat cell index -> flat indices of the other cells within
+# NEAR_RADIUS (Chebyshev distance), i.e. every cell an SOS line through it can reach
+NEAR_RADIUS = 2
+_NEIGHBOR_CACHE: Dict[int, List[Tuple[int, ...]]] = {}
+
+
+def _neighbor_index(size: int) -> List[Tuple[int, ...]]:
+    """Return the cells within NEAR_RADIUS of each cell of a size x size board."""
+    index = _NEIGHBOR_CACHE.get(size)
+    if index is None:
+        index = [
+            tuple(r * size + c
+                  for r in range(max(0, row - NEAR_RADIUS), min(size, row + NEAR_RADIUS + 1))
+                  for c in range(max(0, col - NEAR_RADIUS), min(size, col + NEAR_RADIUS + 1))
+                  if (r, c) != (row, col))
+            for row in range(size) for col in range(size)
+        ]
+        _NEIGHBOR_CACHE[size] = index
+    return index
+
+
+# Zobrist keys: per-size {letter: key} for each flat cell index, plus side and mode keys
+_ZOBRIST_CACHE: Dict[int, List[Dict[str, int]]] = {}
+_ZOBRIST_RED = 0x9E3779B97F4A7C15
+_ZOBRIST_GENERAL = 0xC2B2AE3D27D4EB4F
+
+
+def _zobrist_keys(size: int) -> List[Dict[str, int]]:
+    """Return the fixed-seed Zobrist key table for a size x size board."""
+    keys = _ZOBRIST_CACHE.get(size)
+    if keys is None:
+        rng = random.Random(size)
+        keys = [{"S": rng.getrandbits(64), "O": rng.getrandbits(64)}
+                for _ in range(size * size)]
+        _ZOBRIST_CACHE[size] = keys
+    return keys
+
+
+# The 8 symmetries of the square as (row, col) maps on a size x size board:
+# identity, three rotations, then the four reflections
+_SYMMETRIES = (
+    lambda r, c, n: (r, c),
+    lambda r, c, n: (c, n - 1 - r),
+    lambda r, c, n: (n - 1 - r, n - 1 - c),
+    lambda r, c, n: (n - 1 - c, r),
+    lambda r, c, n: (r, n - 1 - c),
+    lambda r, c, n: (n - 1 - r, c),
+    lambda r, c, n: (c, r),
+    lambda r, c, n: (n - 1 - c, n - 1 - r),
+)
+_SYMMETRY_CACHE: Dict[int, Tuple[Tuple[int, ...], ...]] = {}
+
+
+def symmetry_maps(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """For each of the 8 symmetries, the image of every flat cell index."""
+    maps = _SYMMETRY_CACHE.get(size)
+    if maps is None:
+        maps = tuple(
+            tuple(r * size + c for r, c in (f(i // size, i % size, size)
+                                            for i in range(size * size)))
+            for f in _SYMMETRIES
+        )
+        _SYMMETRY_CACHE[size] = maps
+    return maps
+
+
+def transform_move(size: int, symmetry: int, row: int, col: int) -> Tuple[int, int]:
+    """Map (row, col) through symmetry number <symmetry> (0-7)."""
+    return _SYMMETRIES[symmetry](row, col, size)
+
+
+def canonical_moves(size: int, moves) -> Tuple:
+    """Smallest image of a (row, col, letter, player) sequence over the 8 symmetries.
+
+    Two games that are reflections or rotations of each other get the same result.
+    """
+    # map only the played cells; symmetry_maps would build 8 whole-board tables
+    return min(
+        tuple((*symmetry(row, col, size), letter, player)
+              for row, col, letter, player in moves)
+        for symmetry in _SYMMETRIES
+    )
+
+
 class SOSGameLogic:
+    sparse = False
+
     def __init__(self, size=3, mode="simple", computer_player=None):
         self.computer = computer_player
         self.size = size
@@ -16,83 +141,164 @@ class SOSGameLogic:
 
         # live-log attributes
         self._record_path: Optional[Path] = None
-        self._record_dict: Optional[Dict] = None
+        self._record_log: Optional[JsonlLogWriter] = None
 
         # initialise board + open first log
         self.reset_board()
 
     def reset_board(self, start_logging = True):
         # clear in-memory state
-        self.board  = [["-" for _ in range(self.size)] for _ in range(self.size)]
+        self._attach_tables()
+        self._new_cells()
+        self._board_hash = 0
+        self.empty_count = self.size * self.size
+        self.threat_count = 0       # empty cells where some letter completes an SOS
         self.current_player = "Blue"
         self.sos_lines.clear()
         self.scores = {"Blue": 0, "Red": 0}
+        # undo records for pop_move: (row, col, mover, new_lines)
+        self._history = []
+        # every SOS in the order made: (move index, player, line_key)
+        self.sos_events = []
+        # flat cell -> positions in sos_events of the lines through it
+        self._cell_lines = {}
+
+    def _attach_tables(self):
+        """Point at the shared per-size lookup tables."""
+        self._triplets = _triplet_index(self.size)
+        self._zobrist_keys = _zobrist_keys(self.size)
+        self._neighbors = _neighbor_index(self.size)
+
+    def _new_cells(self):
+        """Allocate the board and the per-cell counters."""
+        self.board  = [["-" for _ in range(self.size)] for _ in range(self.size)]
+        # per-cell counts of triplets an S / an O at that empty cell would complete
+        self._threat_s = bytearray(self.size * self.size)
+        self._threat_o = bytearray(self.size * self.size)
+        # per-cell count of occupied cells within NEAR_RADIUS
+        self._near = bytearray(self.size * self.size)
+
+    def _copy_cells(self, other):
+        """Give <other> its own copies of the board and the per-cell counters."""
+        other.board = [row[:] for row in self.board]
+        other._threat_s = bytearray(self._threat_s)
+        other._threat_o = bytearray(self._threat_o)
+        other._near = bytearray(self._near)
 
-    def start_recording(self, path: str | Path):
-        """Begin writing moves to <path> (JSON). Overwrites if it exists."""
+    def start_recording(self, path: str | Path, fsync: str = "game"):
+        """Begin streaming moves to <path> (JSON Lines). Overwrites if it exists."""
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)   # make sure folder exists
-        self._init_live_log(path)                       # reuse the existing helper
+        self._init_live_log(path, fsync)
 
     def stop_recording(self):
         """Flush and close the current log (called automatically at game end)."""
-        if self._record_path:
-            self._flush_log()
+        if self._record_log is not None:
+            self._record_log.close()
             self._record_path = None
-            self._record_dict = None
+            self._record_log = None
 
-    def _init_live_log(self, path: Path) -> None:
+    def _init_live_log(self, path: Path, fsync: str = "game") -> None:
+        self.stop_recording()
+        self._record_log = JsonlLogWriter(path, self.size, self.mode, fsync)
         self._record_path = path
-        self._record_dict = {
-            "format": "sos-log-json-v1",
-            "size": self.size,
-            "mode": self.mode,
-            "moves": []
-        }
-        self._flush_log()
-
-    def _append_move(self, row: int, col: int, letter: str) -> None:
-        if self._record_dict is not None:
-            self._record_dict["moves"].append({
-                "row": row,
-                "col": col,
-                "letter": letter,
-                "player": self.current_player
-            })
-            self._flush_log()
-
-    def _flush_log(self) -> None:
-        if self._record_path and self._record_dict is not None:
-            with self._record_path.open("w", encoding="utf-8") as fp:
-                json.dump(self._record_dict, fp, indent=2)
+
+    def _append_move(self, row: int, col: int, letter: str, search: Optional[Dict] = None) -> None:
+        if self._record_log is not None:
+            self._record_log.append(row, col, letter, self.current_player, search)
 
     def _finalize_if_over(self, result: str) -> str:
         """Close the log if the game is no longer running."""
-        if result != "continue" and self._record_path:
-            self._flush_log()
-            self._record_path = None
-            self._record_dict = None
+        if result != "continue":
+            self.stop_recording()
         return result
 
+    def clone(self):
+        """Independent copy of the game for searching elsewhere.
+
+        The copy shares the immutable per-size tables but not the log or
+        the attached computer player, so it can be handed to another
+        thread or pickled to another process.
+        """
+        other = object.__new__(type(self))
+        other.__dict__.update(self.__dict__)
+        self._copy_cells(other)
+        other.sos_lines = set(self.sos_lines)
+        other.scores = dict(self.scores)
+        other._history = list(self._history)
+        other.sos_events = list(self.sos_events)
+        other._cell_lines = {cell: ids[:] for cell, ids in self._cell_lines.items()}
+        other._record_path = None
+        other._record_log = None
+        other.computer = None
+        return other
+
+    def __getstate__(self):
+        # the per-size tables are rebuilt from the module caches on unpickling
+        state = dict(self.__dict__)
+        del state["_triplets"], state["_zobrist_keys"], state["_neighbors"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._attach_tables()
+
     def switch_player(self):
         """Switches the current player."""
         self.current_player = "Red" if self.current_player == "Blue" else "Blue"
 
+    @property
+    def zobrist(self) -> int:
+        """64-bit hash of the board, the side to move and the game mode."""
+        key = self._board_hash
+        if self.current_player == "Red":
+            key ^= _ZOBRIST_RED
+        if self.mode == "general":
+            key ^= _ZOBRIST_GENERAL
+        return key
+
+    @property
+    def canonical_zobrist(self) -> int:
+        """The smallest zobrist over the 8 board symmetries.
+
+        Positions that are rotations or reflections of each other share it.
+        """
+        keys = self._zobrist_keys
+        occupied = self.occupied()
+        images = []
+        for cell_map in symmetry_maps(self.size):
+            key = 0
+            for index, letter in occupied:
+                key ^= keys[cell_map[index]][letter]
+            images.append(key)
+        key = min(images)
+        if self.current_player == "Red":
+            key ^= _ZOBRIST_RED
+        if self.mode == "general":
+            key ^= _ZOBRIST_GENERAL
+        return key
+
+    def occupied(self) -> List[Tuple[int, str]]:
+        """(flat index, letter) of every filled cell, in row-major order."""
+        size = self.size
+        return [(r * size + c, letter) for r, row in enumerate(self.board)
+                for c, letter in enumerate(row) if letter != "-"]
+
     def is_valid_move(self, row, col):
         """Checks if a move is valid."""
         return 0 <= row < self.size and 0 <= col < self.size and self.board[row][col] == '-'
 
-    def make_move(self, row, col, letter=None):
+    def make_move(self, row, col, letter=None, search=None):
+        """Play a move; <search> (SearchResult.as_dict()) is stored with it in the log."""
         if not self.is_valid_move(row, col):
             raise ValueError(f"Invalid move at ({row}, {col})")
 
         if letter is None:
             letter = "S" if self.current_player == "Blue" else "O"
 
-        self.board[row][col] = letter
-        found_sos = self.check_sos(row, col)
-
-        self._append_move(row, col, letter)
+        mover = self.current_player
+        self._append_move(row, col, letter, search)
+        found_sos = self.push_move(row, col, letter) > 0
 
         if self.mode == "simple":
             if found_sos:
@@ -100,40 +306,144 @@ class SOSGameLogic:
                     f"{self.current_player.lower()}_wins"
                 )
             if self.is_board_full():
+                # a drawn simple game ends without handing over the turn
+                self.current_player = mover
                 return self._finalize_if_over("draw")
 
-        if not found_sos:
-            self.switch_player()
-
         if self.is_board_full():
             return self._finalize_if_over(self.determine_winner())
         return "continue"
 
+    def push_move(self, row, col, letter):
+        """Place a letter for the current player and return the number of new SOS lines.
+
+        Applies the turn rules (the mover keeps the turn after an SOS) but
+        skips validation and logging. Every push can be undone by pop_move.
+        """
+        index = row * self.size + col
+        self.board[row][col] = letter
+        self._board_hash ^= self._zobrist_keys[index][letter]
+        self.empty_count -= 1
+        if self._threat_s[index] or self._threat_o[index]:
+            self._threat_s[index] = self._threat_o[index] = 0
+            self.threat_count -= 1
+        for cell, need in self._slots(index):
+            self._shift_threat(cell, need, 1)
+        near = self._near
+        for cell in self._neighbors[index]:
+            near[cell] += 1
+
+        player = self.current_player
+        new_lines = self._new_lines(row, col)
+        if new_lines:
+            self.sos_lines.update(new_lines)
+            if self.mode == "general":
+                self.scores[player] += len(new_lines)
+            events = self.sos_events
+            size = self.size
+            for line_key in new_lines:
+                for r, c in line_key:
+                    self._cell_lines.setdefault(r * size + c, []).append(len(events))
+                events.append((len(self._history), player, line_key))
+        else:
+            self.switch_player()
+        self._history.append((row, col, player, new_lines))
+        return len(new_lines)
+
+    def pop_move(self):
+        """Undo the most recent push_move/make_move and return its (row, col)."""
+        row, col, player, new_lines = self._history.pop()
+        index = row * self.size + col
+        self._board_hash ^= self._zobrist_keys[index][self.board[row][col]]
+        for cell, need in self._slots(index):
+            self._shift_threat(cell, need, -1)
+        self.board[row][col] = "-"
+        self.empty_count += 1
+        near = self._near
+        for cell in self._neighbors[index]:
+            near[cell] -= 1
+        # with (row, col) empty again, every open slot left through it is the cell itself
+        for _, need in self._slots(index):
+            self._shift_threat(index, need, 1)
+        if new_lines:
+            self.sos_lines.difference_update(new_lines)
+            if self.mode == "general":
+                self.scores[player] -= len(new_lines)
+            cell_lines = self._cell_lines
+            size = self.size
+            for _, _, line_key in reversed(self.sos_events[-len(new_lines):]):
+                for r, c in line_key:
+                    ids = cell_lines[r * size + c]
+                    ids.pop()
+                    if not ids:
+                        del cell_lines[r * size + c]
+            del self.sos_events[-len(new_lines):]
+        self.current_player = player
+        return row, col
+
+    def lines_at(self, move):
+        """SOS events made by the first <move> moves; a slice of sos_events."""
+        return self.sos_events[:bisect_left(self.sos_events, (move,))]
+
+    def lines_through(self, row, col):
+        """SOS events whose line passes through (row, col), oldest first."""
+        events = self.sos_events
+        return [events[i] for i in self._cell_lines.get(row * self.size + col, ())]
+
+    def _new_lines(self, row, col):
+        """SOS lines through (row, col) that are complete but not yet recorded."""
+        board = self.board
+        sos_lines = self.sos_lines
+        return tuple(
+            line_key
+            for r0, c0, r1, c1, r2, c2, line_key in self._triplets[row * self.size + col]
+            if board[r0][c0] == "S" and board[r1][c1] == "O" and board[r2][c2] == "S"
+            and line_key not in sos_lines
+        )
+
+    def _slots(self, index):
+        """(cell, letter) for each triplet through <index> that one more letter would complete."""
+        board = self.board
+        size = self.size
+        slots = []
+        for r0, c0, r1, c1, r2, c2, _ in self._triplets[index]:
+            middle = board[r1][c1]
+            if middle == "O":
+                first = board[r0][c0]
+                last = board[r2][c2]
+                if first == "S" and last == "-":
+                    slots.append((r2 * size + c2, "S"))
+                elif first == "-" and last == "S":
+                    slots.append((r0 * size + c0, "S"))
+            elif middle == "-" and board[r0][c0] == "S" and board[r2][c2] == "S":
+                slots.append((r1 * size + c1, "O"))
+        return slots
+
+    def _shift_threat(self, index, letter, delta):
+        """Adjust one cell's completion count and keep threat_count in step."""
+        was_threat = self._threat_s[index] or self._threat_o[index]
+        if letter == "S":
+            self._threat_s[index] += delta
+        else:
+            self._threat_o[index] += delta
+        is_threat = self._threat_s[index] or self._threat_o[index]
+        if is_threat and not was_threat:
+            self.threat_count += 1
+        elif was_threat and not is_threat:
+            self.threat_count -= 1
+
     def check_sos(self, row, col):
         """Checks if an SOS sequence is formed at the given position."""
-        directions = [
-            (0, 1), 
-            (1, 0),
-            (1, 1), 
-            (-1, 1),
-            (0, -1),
-            (-1, 0),
-            (-1, -1),
-            (1, -1),
-        ]
-
+        board = self.board
         found_sos = False
 
-        for dr, dc in directions:
-            sos_line = self.find_sos_line(row, col, dr, dc)
-            if sos_line:
+        for r0, c0, r1, c1, r2, c2, line_key in self._triplets[row * self.size + col]:
+            if board[r0][c0] == "S" and board[r1][c1] == "O" and board[r2][c2] == "S":
                 found_sos = True
-                line_key = tuple(sorted(sos_line))
                 if line_key not in self.sos_lines:
                     self.sos_lines.add(line_key)
                     if self.mode == "general":
                         self.scores[self.current_player] += 1
-                    found_sos = True
 
         return found_sos
 
@@ -144,16 +454,19 @@ class SOSGameLogic:
             (row - dr, col - dc),      # check if (row,col) is middle O
             (row, col),                # check if (row,col) is first S
         ]
+        size = self.size
 
         for start_row, start_col in positions:
-            mid_row = start_row + dr
-            mid_col = start_col + dc
             end_row = start_row + 2*dr
             end_col = start_col + 2*dc
 
-            if not all(0 <= r < self.size and 0 <= c < self.size for r, c in [(start_row, start_col), (mid_row, mid_col), (end_row, end_col)]):
+            # the middle cell lies between start and end, so two checks suffice
+            if not (0 <= start_row < size and 0 <= start_col < size
+                    and 0 <= end_row < size and 0 <= end_col < size):
                 continue
 
+            mid_row = start_row + dr
+            mid_col = start_col + dc
             first = self.board[start_row][start_col]
             middle = self.board[mid_row][mid_col]
             last = self.board[end_row][end_col]
@@ -165,7 +478,7 @@ class SOSGameLogic:
 
     def is_board_full(self):
         """Checks if the board is completely filled."""
-        return all(cell != '-' for row in self.board for cell in row)
+        return self.empty_count == 0
 
     def determine_winner(self):
         """Determines the winner based on scores (for General mode)."""
@@ -193,88 +506,870 @@ class GeneralSOSGame(SOSGameLogic):
             return self.determine_winner()
 
         return result
+
+
+DENSE_MAX_SIZE = 20     # larger boards get SparseSOSGameLogic from make_game_logic
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x: int) -> int:
+    """splitmix64 finalizer: a well-spread 64-bit hash of x."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class _SparseRow(dict):
+    """One board row keyed by column: absent columns read as '-', writing '-' deletes.
+
+    Indexing and iteration behave like a list of <size> letters.
+    """
+
+    def __init__(self, size):
+        super().__init__()
+        self.size = size
+
+    def __missing__(self, col):
+        return "-"
+
+    def __setitem__(self, col, letter):
+        if letter == "-":
+            self.pop(col, None)
+        else:
+            dict.__setitem__(self, col, letter)
+
+    def __iter__(self):
+        return (self[c] for c in range(self.size))
+
+    def __len__(self):
+        return self.size
+
+    def copy(self):
+        other = _SparseRow(self.size)
+        other.update(self.items())
+        return other
+
+
+class _SparseCounts(dict):
+    """Per-cell counters that only store non-zero entries."""
+
+    def __missing__(self, index):
+        return 0
+
+    def __setitem__(self, index, value):
+        if value:
+            dict.__setitem__(self, index, value)
+        else:
+            self.pop(index, None)
+
+
+class _LazyTable:
+    """Per-cell table computed on first use, for boards too big to precompute."""
+
+    def __init__(self, size, build):
+        self.size = size
+        self._build = build
+        self._cells = {}
+
+    def __getitem__(self, index):
+        entry = self._cells.get(index)
+        if entry is None:
+            entry = self._cells[index] = self._build(self.size, index)
+        return entry
+
+
+def _cell_triplets(size, index):
+    """The S-O-S triplets through one cell, as in _triplet_index."""
+    row, col = divmod(index, size)
+    triplets = []
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for k in range(3):
+            r0, c0 = row - k * dr, col - k * dc
+            r2, c2 = r0 + 2 * dr, c0 + 2 * dc
+            if 0 <= r0 < size and 0 <= c0 < size and 0 <= r2 < size and 0 <= c2 < size:
+                r1, c1 = r0 + dr, c0 + dc
+                triplets.append((r0, c0, r1, c1, r2, c2, ((r0, c0), (r1, c1), (r2, c2))))
+    return tuple(triplets)
+
+
+def _cell_neighbors(size, index):
+    row, col = divmod(index, size)
+    return tuple(r * size + c
+                 for r in range(max(0, row - NEAR_RADIUS), min(size, row + NEAR_RADIUS + 1))
+                 for c in range(max(0, col - NEAR_RADIUS), min(size, col + NEAR_RADIUS + 1))
+                 if (r, c) != (row, col))
+
+
+def _cell_zobrist(size, index):
+    base = (size << 40) ^ (index << 1)
+    return {"S": _mix64(base), "O": _mix64(base | 1)}
+
+
+class SparseSOSGameLogic(SOSGameLogic):
+    """SOSGameLogic for very large boards; memory and work scale with the letters played.
+
+    Rows are dicts holding only filled cells, the threat and proximity
+    counters keep only non-zero cells, and triplets, neighbours and Zobrist
+    keys are computed per cell on first use. Rules, results, push/pop and
+    logging are those of SOSGameLogic. candidate_cells() gives the frontier
+    (empty cells within NEAR_RADIUS of a letter), which ComputerPlayer
+    searches instead of the whole board.
+    """
+    sparse = True
+
+    def _attach_tables(self):
+        self._triplets = _LazyTable(self.size, _cell_triplets)
+        self._zobrist_keys = _LazyTable(self.size, _cell_zobrist)
+        self._neighbors = _LazyTable(self.size, _cell_neighbors)
+
+    def _new_cells(self):
+        self.board = [_SparseRow(self.size) for _ in range(self.size)]
+        self._threat_s = _SparseCounts()
+        self._threat_o = _SparseCounts()
+        self._near = _SparseCounts()
+
+    def _copy_cells(self, other):
+        other.board = [row.copy() for row in self.board]
+        other._threat_s = _SparseCounts(self._threat_s)
+        other._threat_o = _SparseCounts(self._threat_o)
+        other._near = _SparseCounts(self._near)
+
+    def occupied(self):
+        size = self.size
+        return sorted((r * size + c, letter) for r, row in enumerate(self.board)
+                      for c, letter in row.items())
+
+    def candidate_cells(self) -> List[Tuple[int, int]]:
+        """Empty cells within NEAR_RADIUS of a letter, or the centre of an empty board."""
+        size = self.size
+        board = self.board
+        cells = [divmod(index, size) for index in sorted(self._near)]
+        cells = [(r, c) for r, c in cells if board[r][c] == "-"]
+        if not cells and self.empty_count == size * size:
+            cells = [(size // 2, size // 2)]
+        return cells
+
+
+def make_game_logic(size=3, mode="simple", computer_player=None):
+    """SOSGameLogic, or SparseSOSGameLogic for boards above DENSE_MAX_SIZE."""
+    cls = SparseSOSGameLogic if size > DENSE_MAX_SIZE else SOSGameLogic
+    return cls(size, mode, computer_player)
+
+
+class SOSBitboard:
+    """Alternate board engine storing S and O occupancy as integer bitmasks.
+
+    Cell (row, col) maps to bit ``row * size + col``. Results of
+    ``make_move``/``check_sos`` match SOSGameLogic exactly; recording is not
+    supported. It stays outside make_game_logic: it has no push_move/pop_move,
+    sos_events or threat counters, which ComputerPlayer, the GUI and the
+    server all rely on, so it only serves callers that just play moves.
+    """
+
+    def __init__(self, size=3, mode="simple"):
+        self.size = size
+        self.mode = mode
+        self.sos_lines = set()
+        n = size
+        full = (1 << (n * n)) - 1
+
+        def starts(keep):
+            mask = 0
+            for r in range(n):
+                for c in range(n):
+                    if keep(r, c):
+                        mask |= 1 << (r * n + c)
+            return mask & full
+
+        # (shift, valid start mask, dr, dc) for the four SOS axes
+        self._axes = (
+            (1, starts(lambda r, c: c <= n - 3), 0, 1),
+            (n, starts(lambda r, c: r <= n - 3), 1, 0),
+            (n + 1, starts(lambda r, c: r <= n - 3 and c <= n - 3), 1, 1),
+            (n - 1, starts(lambda r, c: r <= n - 3 and c >= 2), 1, -1),
+        )
+        self.reset_board()
+
+    def reset_board(self):
+        self.s_mask = 0
+        self.o_mask = 0
+        self.empty_count = self.size * self.size
+        self.current_player = "Blue"
+        self.sos_lines.clear()
+        self.scores = {"Blue": 0, "Red": 0}
+
+    @property
+    def board(self):
+        """Snapshot of the board as a list of lists, like SOSGameLogic.board."""
+        n = self.size
+        rows = []
+        for r in range(n):
+            row = []
+            for c in range(n):
+                bit = 1 << (r * n + c)
+                row.append("S" if self.s_mask & bit else "O" if self.o_mask & bit else "-")
+            rows.append(row)
+        return rows
+
+    def switch_player(self):
+        """Switches the current player."""
+        self.current_player = "Red" if self.current_player == "Blue" else "Blue"
+
+    def is_valid_move(self, row, col):
+        """Checks if a move is valid."""
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return False
+        return not ((self.s_mask | self.o_mask) >> (row * self.size + col)) & 1
+
+    def make_move(self, row, col, letter=None):
+        if not self.is_valid_move(row, col):
+            raise ValueError(f"Invalid move at ({row}, {col})")
+
+        if letter is None:
+            letter = "S" if self.current_player == "Blue" else "O"
+
+        bit = 1 << (row * self.size + col)
+        if letter == "S":
+            self.s_mask |= bit
+        else:
+            self.o_mask |= bit
+        self.empty_count -= 1
+        found_sos = self.check_sos(row, col)
+
+        if self.mode == "simple":
+            if found_sos:
+                return f"{self.current_player.lower()}_wins"
+            if self.is_board_full():
+                return "draw"
+
+        if not found_sos:
+            self.switch_player()
+
+        if self.is_board_full():
+            return self.determine_winner()
+        return "continue"
+
+    def check_sos(self, row, col):
+        """Checks if an SOS sequence is formed at the given position."""
+        n = self.size
+        s_mask = self.s_mask
+        o_mask = self.o_mask
+        bit = 1 << (row * n + col)
+        found_sos = False
+
+        for shift, valid, dr, dc in self._axes:
+            starts = (bit | bit >> shift | bit >> (2 * shift)) & valid
+            hits = starts & s_mask & (o_mask >> shift) & (s_mask >> (2 * shift))
+            while hits:
+                low = hits & -hits
+                hits ^= low
+                r0, c0 = divmod(low.bit_length() - 1, n)
+                found_sos = True
+                line_key = ((r0, c0), (r0 + dr, c0 + dc), (r0 + 2*dr, c0 + 2*dc))
+                if line_key not in self.sos_lines:
+                    self.sos_lines.add(line_key)
+                    if self.mode == "general":
+                        self.scores[self.current_player] += 1
+
+        return found_sos
+
+    def is_board_full(self):
+        """Checks if the board is completely filled."""
+        return self.empty_count == 0
+
+    def determine_winner(self):
+        """Determines the winner based on scores (for General mode)."""
+        blue_score = self.scores["Blue"]
+        red_score = self.scores["Red"]
+
+        if blue_score > red_score:
+            return "blue_wins"
+        elif red_score > blue_score:
+            return "red_wins"
+        return "draw"
+
+
+# value of a forced Simple-mode win; real scores stay far below it
+WIN_SCORE = 1000
+# strategy="mcts" hands positions with at most this many empty cells, or this
+# share of the board, to alpha-beta, which counts the closing SOS chains exactly
+MCTS_ENDGAME_EMPTY = 70
+MCTS_ENDGAME_SHARE = 0.45
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out or it is cancelled."""
+
+
+class TranspositionTable:
+    """Fixed-capacity table of search results keyed by SOSGameLogic.zobrist.
+
+    Each slot holds one entry. A colliding entry is replaced when it comes
+    from an earlier search or was searched no deeper than the new one.
+    """
+    EXACT, LOWER, UPPER = 0, 1, 2
+
+    def __init__(self, capacity=1 << 18):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def probe(self, key):
+        """Return (key, depth, flag, value, best_move, generation) or None."""
+        self.probes += 1
+        entry = self._slots[key % self.capacity]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, flag, value, best_move):
+        index = key % self.capacity
+        old = self._slots[index]
+        if old is not None and old[0] != key:
+            if old[5] == self.generation and old[1] > depth:
+                return
+            self.overwrites += 1
+        self._slots[index] = (key, depth, flag, value, best_move, self.generation)
+        self.stores += 1
+
+    def new_search(self):
+        """Age existing entries so the next search may replace them freely."""
+        self.generation += 1
+
+    def clear(self):
+        self._slots = [None] * self.capacity
+        self.probes = self.hits = self.stores = self.overwrites = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        used = sum(1 for entry in self._slots if entry is not None)
+        return {
+            "capacity": self.capacity,
+            "used": used,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+        }
+
+
+class SearchResult:
+    """Move chosen by ComputerPlayer.search and what it cost to find.
+
+    source is "search", "book", "random" or "mcts" (an mcts player's
+    endgame moves come from "search"); depth is the deepest completed
+    iteration and value its score for the side to move (None if no
+    iteration finished). expanded counts nodes whose moves were searched
+    and cutoffs those among them that failed high. For MCTS, nodes counts
+    playouts, depth the deepest tree descent and value the chosen move's
+    win rate. A book move's value is the stored table value, which in
+    Simple mode is +1 / 0 / -1 rather than the search's +/-WIN_SCORE scale.
+    """
+
+    def __init__(self, move=None, value=None, depth=0, nodes=0, expanded=0, cutoffs=0,
+                 tt_hits=0, tt_probes=0, elapsed=0.0, source="search"):
+        self.move = move
+        self.value = value
+        self.depth = depth
+        self.nodes = nodes
+        self.expanded = expanded
+        self.cutoffs = cutoffs
+        self.tt_hits = tt_hits
+        self.tt_probes = tt_probes
+        self.elapsed = elapsed
+        self.source = source
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def cutoff_rate(self) -> float:
+        return self.cutoffs / self.expanded if self.expanded else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def as_dict(self) -> Dict:
+        data = dict(self.__dict__)
+        data["move"] = list(self.move) if self.move else None
+        data.update(nps=self.nps, cutoff_rate=self.cutoff_rate, tt_hit_rate=self.tt_hit_rate)
+        return data
+
+    def __repr__(self):
+        return (f"SearchResult(move={self.move}, value={self.value}, depth={self.depth}, "
+                f"nodes={self.nodes}, elapsed={self.elapsed:.3f}s, nps={self.nps:.0f})")
+
+
+class SearchProfiler:
+    """Opt-in profiling of ComputerPlayer searches.
+
+    Pass one as ComputerPlayer(profiler=...). Every search then runs under
+    cProfile (unless use_cprofile is False) and its wall time is added to a
+    histogram, so slow functions such as check_sos or evaluate_board show
+    up in dump() and slow moves in histogram().
+    """
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self, use_cprofile=True):
+        self.profile = cProfile.Profile() if use_cprofile else None
+        self.times: List[float] = []
+
+    def run(self, func, *args):
+        start = time.perf_counter()
+        if self.profile is not None:
+            result = self.profile.runcall(func, *args)
+        else:
+            result = func(*args)
+        self.times.append(time.perf_counter() - start)
+        return result
+
+    def histogram(self) -> Dict[str, int]:
+        """Search count per wall-time bucket, labelled by upper bound ("<=5ms", ">5000ms")."""
+        counts = {f"<={bound}ms": 0 for bound in self.BUCKETS_MS}
+        counts[f">{self.BUCKETS_MS[-1]}ms"] = 0
+        for seconds in self.times:
+            ms = seconds * 1000
+            bound = next((b for b in self.BUCKETS_MS if ms <= b), None)
+            counts[f"<={bound}ms" if bound is not None else f">{self.BUCKETS_MS[-1]}ms"] += 1
+        return counts
+
+    def dump(self, path=None, sort="cumulative", limit=25) -> str:
+        """Write raw cProfile stats to <path> if given; return the top <limit> functions as text."""
+        if self.profile is None:
+            return ""
+        if path is not None:
+            self.profile.dump_stats(str(path))
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
 class ComputerPlayer:
-    def __init__(self, player_color="Red", strategy="minimax"):
+    def __init__(self, player_color="Red", strategy="minimax", max_depth=None,
+                 time_budget_ms=1000, tt_size=1 << 18, seed=None, workers=1, book=None,
+                 ordering=True, prune=False, profiler=None, playouts=None, exploration=1.4,
+                 endgame=None):
+        if strategy not in ("minimax", "random", "mcts"):
+            raise ValueError(f"Unknown strategy {strategy!r}")
         self.player_color = player_color
         self.strategy = strategy
+        self.max_depth = max_depth              # None: search until the board is full
+        self.time_budget_ms = time_budget_ms
+        self.tt = TranspositionTable(tt_size) if tt_size else None
+        self.workers = workers                  # >1: split the root across processes (if >1 CPU)
+        self.ordering = ordering                # completing, blocking, nearby, distant moves
+        self.prune = prune                      # drop cells with no letter within NEAR_RADIUS
+        self.profiler = profiler                # optional SearchProfiler wrapped around searches
+        self.last_result = None                 # SearchResult of the latest choose_move
+        self._pool = None
+        self._manager = None                    # owns the stop event and report queue of the pool
+        if isinstance(book, (str, Path)):
+            from sosBook import Tablebase
+            book = Tablebase.load(book)
+        self.book = book                        # exact table consulted before searching
+        self._rng = random.Random(seed)
+        # MCTS keeps its tree between moves, so one instance per player
+        self._mcts = MCTS(self._moves, time_budget_ms, playouts, exploration,
+                          seed=seed) if strategy == "mcts" else None
+        self.endgame = endgame                  # mcts: empty cells where alpha-beta takes over
+        self._deadline = float("inf")
+        self._cancel = None
+        self._nodes = 0
+        self._expanded = 0                      # nodes whose moves were searched
+        self._cutoffs = 0                       # of those, ones that failed high
+        self._tt_base = (0, 0)                  # table hits and probes when the search began
+
+    def minimax(self, game_logic, depth, alpha, beta):
+        """Alpha-beta search in negamax form; returns (value, best_move).
+
+        The value is from the side to move's point of view: SOS lines it
+        still gains minus those the opponent gains (General mode), or
+        +/-WIN_SCORE for a forced win or loss (Simple mode).
+        """
+        self._nodes += 1
+        if not self._nodes & 255 and (time.perf_counter() > self._deadline
+                                      or self._cancel is not None and self._cancel.is_set()):
+            raise _SearchTimeout
 
-    def minimax(self, game_logic, depth, is_maximizing, alpha, beta):
         if depth == 0 or game_logic.is_board_full():
-            return self.evaluate_board(game_logic, self.player_color), None
+            return self.evaluate_board(game_logic, game_logic.current_player), None
 
+        tt = self.tt
+        tt_move = None
+        alpha_orig = alpha
+        if tt is not None:
+            key = game_logic.zobrist
+            entry = tt.probe(key)
+            if entry is not None:
+                _, tt_depth, flag, tt_value, tt_move, _ = entry
+                if tt_depth >= depth:
+                    if flag == TranspositionTable.EXACT:
+                        return tt_value, tt_move
+                    if flag == TranspositionTable.LOWER:
+                        alpha = max(alpha, tt_value)
+                    else:
+                        beta = min(beta, tt_value)
+                    if beta <= alpha:
+                        return tt_value, tt_move
+
+        moves = self._moves(game_logic)
+        if tt_move in moves:
+            moves.remove(tt_move)
+            moves.insert(0, tt_move)
+
+        best_value = float("-inf")
         best_move = None
-        max_eval = float('-inf')
-        min_eval = float('inf')
-
-        for r in range(game_logic.size):
-            for c in range(game_logic.size):
-                if game_logic.is_valid_move(r, c):
-                    for letter in ["S", "O"]:
-                        # Simulate move
-                        original = game_logic.board[r][c]
-                        game_logic.board[r][c] = letter
-
-                        # Evaluate resulting board
-                        score = self.evaluate_board(
-                            game_logic,
-                            self.player_color if is_maximizing else self.get_opponent(self.player_color)
-                        )
-
-                        # Undo move
-                        game_logic.board[r][c] = original
-
-                        if is_maximizing:
-                            if score > max_eval:
-                                max_eval = score
-                                best_move = (r, c, letter)
-                            alpha = max(alpha, score)
-                            if beta <= alpha:
-                                break
-                        else:
-                            if score < min_eval:
-                                min_eval = score
-                                best_move = (r, c, letter)
-                            beta = min(beta, score)
-                            if beta <= alpha:
-                                break
-
-        return (max_eval if is_maximizing else min_eval), best_move
+        self._expanded += 1
+        for move in moves:
+            value = self._move_value(game_logic, move, depth, alpha, beta)
+            if value > best_value:
+                best_value = value
+                best_move = move
+            alpha = max(alpha, value)
+            if beta <= alpha:
+                self._cutoffs += 1
+                break
+
+        if best_move is None:
+            return 0, None
+        if tt is not None:
+            if best_value <= alpha_orig:
+                flag = TranspositionTable.UPPER
+            elif best_value >= beta:
+                flag = TranspositionTable.LOWER
+            else:
+                flag = TranspositionTable.EXACT
+            tt.store(key, depth, flag, best_value, best_move)
+        return best_value, best_move
+
+    def _move_value(self, game_logic, move, depth, alpha, beta):
+        """Value of playing <move> for the side to move, searched to <depth> plies."""
+        row, col, letter = move
+        gained = game_logic.push_move(row, col, letter)
+        if gained and game_logic.mode == "simple":
+            value = WIN_SCORE + depth           # prefer the quickest win
+        elif game_logic.is_board_full():
+            value = gained
+        elif gained:
+            # General mode: the mover plays again, so the sign does not flip
+            value = gained + self.minimax(game_logic, depth - 1, alpha - gained, beta - gained)[0]
+        else:
+            value = -self.minimax(game_logic, depth - 1, -beta, -alpha)[0]
+        game_logic.pop_move()
+        return value
+
+    def _moves(self, game_logic):
+        """Legal (row, col, letter) moves, best candidates first when ordering is on.
+
+        Ordering puts moves that complete an SOS first, then the other
+        letter on those cells (blocking the line), then cells within
+        NEAR_RADIUS of a letter and finally the rest. prune drops the last
+        group unless nothing else is left.
+        """
+        board = game_logic.board
+        size = game_logic.size
+        if game_logic.sparse:
+            return self._frontier_moves(game_logic)
+        if not (self.ordering or self.prune):
+            return [(r, c, letter)
+                    for r in range(size)
+                    for c in range(size)
+                    if board[r][c] == "-"
+                    for letter in ("S", "O")]
+
+        threat_s = game_logic._threat_s
+        threat_o = game_logic._threat_o
+        near = game_logic._near
+        completing, blocking, nearby, distant = [], [], [], []
+        index = 0
+        for r, row in enumerate(board):
+            for c, letter in enumerate(row):
+                if letter == "-":
+                    if threat_s[index] or threat_o[index]:
+                        (completing if threat_s[index] else blocking).append((r, c, "S"))
+                        (completing if threat_o[index] else blocking).append((r, c, "O"))
+                    elif near[index]:
+                        nearby += ((r, c, "S"), (r, c, "O"))
+                    else:
+                        distant += ((r, c, "S"), (r, c, "O"))
+                index += 1
+        if self.prune and (completing or blocking or nearby):
+            distant = []
+        if not self.ordering:
+            return sorted(completing + blocking + nearby + distant)
+        return completing + blocking + nearby + distant
+
+    def _frontier_moves(self, game_logic):
+        """Moves on a sparse board's candidate cells, ordered as in _moves.
+
+        Cells away from every letter are never searched; if no candidate is
+        left, any empty cell is offered so the game can always continue.
+        """
+        size = game_logic.size
+        threat_s = game_logic._threat_s
+        threat_o = game_logic._threat_o
+        completing, blocking, nearby = [], [], []
+        for r, c in game_logic.candidate_cells():
+            index = r * size + c
+            if threat_s[index] or threat_o[index]:
+                (completing if threat_s[index] else blocking).append((r, c, "S"))
+                (completing if threat_o[index] else blocking).append((r, c, "O"))
+            else:
+                nearby += ((r, c, "S"), (r, c, "O"))
+        moves = completing + blocking + nearby
+        if not moves and game_logic.empty_count:
+            row, col = next((r, c) for r in range(size) for c in range(size)
+                            if game_logic.board[r][c] == "-")
+            moves = [(row, col, "S"), (row, col, "O")]
+        return moves if self.ordering else sorted(moves)
 
     def evaluate_board(self, game_logic, player):
-        opponent = self.get_opponent(player)
-        player_score = self.simulate_score(game_logic, player)
-        opponent_score = self.simulate_score(game_logic, opponent)
-        return player_score - opponent_score
-
-    def simulate_score(self, game_logic, player):
-        temp_score = 0
-        letter = "S" if player == "Blue" else "O"
-        for r in range(game_logic.size):
-            for c in range(game_logic.size):
-                if game_logic.is_valid_move(r, c):
-                    game_logic.board[r][c] = letter
-                    if game_logic.check_sos(r, c):
-                        temp_score += 1
-                    game_logic.board[r][c] = '-'
-        return temp_score
+        """Static score of the position from <player>'s point of view.
+
+        Open SOS completions belong to whoever moves next, since General mode
+        lets them chain every one and Simple mode ends on the first.
+        """
+        threats = self.simulate_score(game_logic)
+        if threats and game_logic.mode == "simple":
+            threats = WIN_SCORE
+        return threats if player == game_logic.current_player else -threats
+
+    def simulate_score(self, game_logic):
+        """Count empty cells where an S or an O would complete an SOS."""
+        return game_logic.threat_count
 
     def get_opponent(self, player):
         return "Red" if player == "Blue" else "Blue"   
 
-    def choose_move(self, game_logic):
-        # Use 'S' if it's Blue's turn, 'O' if Red's turn
-        current_player = game_logic.current_player
-        valid_letter = "S" if current_player == "Blue" else "O"
-
-        _, move = self.minimax(
-            game_logic,
-            depth=2,
-            is_maximizing=True,
-            alpha=float('-inf'),
-            beta=float('inf')
-        )
+    def choose_move(self, game_logic, cancel=None, progress=None):
+        """Pick (row, col, letter) by iterative deepening within time_budget_ms.
+
+        <cancel> is an optional threading.Event; once set the search stops
+        and None is returned. <progress> is called with a dict after each
+        completed depth. Statistics of the search are left in last_result.
+        """
+        return self.search(game_logic, cancel, progress).move
+
+    def search(self, game_logic, cancel=None, progress=None):
+        """Like choose_move, but return the full SearchResult."""
+        if self.profiler is not None:
+            result = self.profiler.run(self._run_search, game_logic, cancel, progress)
+        else:
+            result = self._run_search(game_logic, cancel, progress)
+        self.last_result = result
+        return result
+
+    def _run_search(self, game_logic, cancel, progress):
+        start = time.perf_counter()
+        result = SearchResult()
+        moves = self._moves(game_logic)
+        book_move = None
+        if moves and self.strategy != "random" and self.book is not None:
+            book_move = self.book.best_move(game_logic)
+        if not moves:
+            pass
+        elif self.strategy == "random":
+            result.move, result.source = self._rng.choice(moves), "random"
+        elif book_move is not None:
+            result.move, result.source = book_move, "book"
+            result.value = self.book.value(game_logic)
+        elif self.strategy == "mcts" \
+                and game_logic.empty_count > self._endgame_empty(game_logic):
+            self._mcts.time_budget_ms = self.time_budget_ms
+            move, stats = self._mcts.search(game_logic, cancel)
+            result.source = "mcts"
+            result.nodes, result.depth, result.value = (stats["playouts"], stats["depth"],
+                                                        stats["value"])
+            result.move = None if cancel is not None and cancel.is_set() else move
+        else:
+            # on a single CPU the pool only adds overhead: search inline
+            if self.workers > 1 and len(moves) > 1 and (os.cpu_count() or 1) > 1:
+                move, value, depth, counters = self._parallel_choose(game_logic, moves,
+                                                                      cancel, progress)
+            else:
+                completed, move, _ = self._deepen(game_logic, moves, cancel, progress)
+                value = depth = None
+                if completed:
+                    depth, value, move = completed[-1]
+                counters = self._counters()
+            result.value, result.depth = value, depth or 0
+            for name, count in counters.items():
+                setattr(result, name, count)
+            if cancel is not None and cancel.is_set():
+                move = None
+            else:
+                move = move or moves[0]
+            result.move = move
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    def _endgame_empty(self, game_logic):
+        """Empty cells at or below which strategy="mcts" searches with alpha-beta."""
+        if self.endgame is not None:
+            return self.endgame
+        return min(MCTS_ENDGAME_EMPTY, int(game_logic.size ** 2 * MCTS_ENDGAME_SHARE))
+
+    def _counters(self):
+        """Work done by the last _deepen call, for SearchResult."""
+        tt_hits = tt_probes = 0
+        if self.tt is not None:
+            tt_hits = self.tt.hits - self._tt_base[0]
+            tt_probes = self.tt.probes - self._tt_base[1]
+        return {"nodes": self._nodes, "expanded": self._expanded, "cutoffs": self._cutoffs,
+                "tt_hits": tt_hits, "tt_probes": tt_probes}
+
+    def _deepen(self, game_logic, moves, cancel=None, progress=None):
+        """Iterative deepening over the given root moves.
+
+        Returns (completed, partial_move, final): one (depth, value, move)
+        per finished iteration, the best move of an interrupted iteration,
+        and whether the search ended on a proven result rather than the clock.
+        """
+        self._deadline = time.perf_counter() + self.time_budget_ms / 1000
+        self._cancel = cancel
+        self._nodes = self._expanded = self._cutoffs = 0
+        if self.tt is not None:
+            self.tt.new_search()
+            self._tt_base = (self.tt.hits, self.tt.probes)
+        moves = list(moves)
+        root_len = len(game_logic._history)
+        max_depth = self.max_depth or game_logic.empty_count
+        completed = []
+        partial_move = None
+
+        for depth in range(1, max_depth + 1):
+            best_value = float("-inf")
+            iteration_move = None
+            alpha = float("-inf")
+            try:
+                for move in moves:
+                    value = self._move_value(game_logic, move, depth, alpha, float("inf"))
+                    if value > best_value:
+                        best_value = value
+                        iteration_move = move
+                    alpha = max(alpha, value)
+            except _SearchTimeout:
+                while len(game_logic._history) > root_len:
+                    game_logic.pop_move()
+                # a partial iteration still beats nothing at all
+                partial_move = iteration_move
+                return completed, partial_move, False
+
+            completed.append((depth, best_value, iteration_move))
+            if progress is not None:
+                progress({"depth": depth, "move": iteration_move, "value": best_value,
+                          "nodes": self._nodes})
+            # search the previous best first on the next, deeper pass
+            moves.remove(iteration_move)
+            moves.insert(0, iteration_move)
+            if abs(best_value) >= WIN_SCORE or depth >= game_logic.empty_count:
+                return completed, partial_move, True
+
+        return completed, partial_move, True
+
+    def _parallel_choose(self, game_logic, moves, cancel=None, progress=None):
+        """Split the root moves across the process pool and merge the results.
+
+        Each worker deepens its own share of the root under the same budget.
+        Results are compared at the deepest depth every unfinished worker
+        completed; a worker that proved its result counts at any depth.
+        While the workers run, setting <cancel> stops all of them and every
+        finished iteration reaches <progress> tagged with its "worker".
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self._manager = multiprocessing.Manager()
+            self._stop = self._manager.Event()
+            self._reports = self._manager.Queue()
+        self._stop.clear()
+        options = {
+            "strategy": self.strategy,
+            "max_depth": self.max_depth,
+            "time_budget_ms": self.time_budget_ms,
+            "tt_size": self.tt.capacity if self.tt is not None else 0,
+            "ordering": self.ordering,
+            "prune": self.prune,
+        }
+        snapshot = game_logic.clone()
+        futures = [self._pool.submit(_search_root_moves, snapshot, moves[i::self.workers], options,
+                                     self._stop, self._reports, i)
+                   for i in range(self.workers) if moves[i::self.workers]]
+        running = futures
+        while running:
+            _, running = wait(running, timeout=0.05)
+            if cancel is not None and cancel.is_set():
+                self._stop.set()
+            self._forward_reports(progress)
+        self._forward_reports(progress)
+        results = [future.result() for future in futures]
+
+        unfinished = [completed[-1][0] if completed else 0
+                      for completed, _, final, _ in results if not final]
+        common_depth = min(unfinished) if unfinished else None
+        best_value = float("-inf")
+        best_move = None
+        best_depth = 0
+        totals = dict.fromkeys(results[0][3], 0)
+        for completed, partial_move, final, counters in results:
+            for name, count in counters.items():
+                totals[name] += count
+            depth = 0
+            if final and completed:
+                depth, value, move = completed[-1]
+            else:
+                at_depth = [entry for entry in completed if entry[0] == common_depth]
+                if at_depth:
+                    depth, value, move = at_depth[0]
+                else:
+                    # no comparable iteration: only good as a fallback
+                    value = float("-inf")
+                    move = completed[-1][2] if completed else partial_move
+            if move is not None and (best_move is None or value > best_value):
+                best_value, best_move, best_depth = value, move, depth
+        if best_value == float("-inf"):
+            best_value = None
+        return best_move, best_value, best_depth, totals
+
+    def _forward_reports(self, progress):
+        """Hand the iteration reports queued by the workers to <progress>."""
+        while True:
+            try:
+                report = self._reports.get_nowait()
+            except queue.Empty:
+                return
+            if progress is not None:
+                progress(report)
+
+    def close(self):
+        """Shut down the worker pool used by parallel search, if any."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._manager.shutdown()
+            self._manager = None
+
+
+def _search_root_moves(game_logic, moves, options, stop=None, reports=None, worker=0):
+    """Process-pool entry point: deepen over a share of the root moves.
 
-        if move:
-            return (move[0], move[1], valid_letter)
-        
-        return None
\ No newline at end of file
+    <stop> and <reports> are Manager proxies shared with the parent: the
+    event cancels the search and each finished iteration is queued.
+    """
+    player = ComputerPlayer(player_color=game_logic.current_player, **options)
+    progress = None
+    if reports is not None:
+        def progress(report):
+            reports.put(dict(report, worker=worker))
+    return player._deepen(game_logic, moves, stop, progress) + (player._counters(),)
@@ -1,12 +1,13 @@
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QFileDialog, QAction,
-                             QGridLayout, QWidget, QVBoxLayout, QLabel,
+                             QWidget, QVBoxLayout, QLabel,
                              QRadioButton, QDialog, QHBoxLayout, QSlider,
-                             QMessageBox, QButtonGroup, QCheckBox)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont
-from sosGameLogic import SOSGameLogic, ComputerPlayer
-import json
+                             QMessageBox, QButtonGroup, QCheckBox, QInputDialog)
+from PyQt5.QtCore import Qt, QTimer, QRect, QThread, pyqtSignal
+from PyQt5.QtGui import QFont, QPainter, QPen, QColor
+from sosGameLogic import SOSGameLogic, ComputerPlayer, make_game_logic
+from sosLog import BinaryLogReader, read_log
 from pathlib import Path
+import threading
 class SetupWindow(QDialog):
     def __init__(self):
         super().__init__()
@@ -28,7 +29,8 @@ class SetupWindow(QDialog):
         # Slider for board size
         self.size_slider = QSlider(Qt.Horizontal)
         self.size_slider.setMinimum(3)
-        self.size_slider.setMaximum(20)
+        # boards above DENSE_MAX_SIZE use the sparse engine
+        self.size_slider.setMaximum(100)
         self.size_slider.setValue(3)
         self.size_slider.setTickInterval(1)
         self.size_slider.setTickPosition(QSlider.TicksBelow)
@@ -186,66 +188,214 @@ class SetupWindow(QDialog):
             self,
             "Open SOS log",
             "logs",
-            "SOS logs (*.sos.json *.json)"
+            "SOS logs (*.sos.jsonl *.sos.json *.json *.sosb)"
         )
         if not path:
             return
 
         self.accept()    
-        game = SOSGame()   
-        game.show()
-
-        game.is_replaying = True
-        game.logic = SOSGameLogic()
-        game.replay = SOSReplay(game.logic)
-        game.replay.load_json(path)
-        game.rebuild_board_widgets()
-
-        # lock the UI
-        for btn in game.buttons_flat:
-            btn.setEnabled(False)
-
-        # start the animated replay
-        game.replay.replay_stepwise(game.redraw_board, ms_delay=600)
+        self.game = SOSGame()   
+        self.game.show()
+        self.game.start_replay(path)
 class SOSReplay:
-    def __init__(self, logic: SOSGameLogic):
-        self.logic = logic
+    def __init__(self, logic: SOSGameLogic | None = None):
+        self.logic = logic   # replaced by load_log with an engine sized for the log
         self.moves = []      # list[(row,col,letter,player)]
         self._idx = 0        # next move to apply
+        self.truncated = False
         self._timer: QTimer | None = None
-
-    def load_json(self, path: str | Path):
-        self.logic.reset_board(start_logging=False)
-        with open(path, encoding="utf-8") as fp:
-            data = json.load(fp)
-        if data.get("format") != "sos-log-json-v1":
-            raise ValueError("Unrecognised log format")
-        self.logic.size = data["size"]
-        self.logic.mode = data["mode"]
-        self.logic.reset_board(start_logging=False) 
-        self.logic.reset_board()            # wipes board & scores
-        self.moves = [(m["row"], m["col"], m["letter"], m["player"])
-                      for m in data["moves"]]
+        self._on_finished = None
+
+    def load_log(self, path: str | Path, game: int = 0):
+        """Load a JSON Lines, legacy JSON or binary game log for replay."""
+        data = read_log(path, game)
+        # a fresh engine, sparse for large boards, as for a new game
+        self.logic = make_game_logic(data["size"], data["mode"])
+        self.moves = data["moves"]
+        self.truncated = data.get("truncated", False)   # last record was cut short
         self._idx = 0
 
+    @property
+    def position(self) -> int:
+        """Number of moves currently applied to the board."""
+        return self._idx
+
+    @property
+    def is_playing(self) -> bool:
+        return self._timer is not None and self._timer.isActive()
+
+    def seek(self, index: int):
+        """Jump to the position after <index> moves.
+
+        Moves are applied with push_move and taken back with pop_move, so a
+        seek costs one undo record per move crossed and never re-simulates
+        the game from the start.
+        """
+        index = max(0, min(index, len(self.moves)))
+        while self._idx > index:
+            self.logic.pop_move()
+            self._idx -= 1
+        while self._idx < index:
+            r, c, L, _ = self.moves[self._idx]
+            self.logic.push_move(r, c, L)
+            self._idx += 1
+
+    def step_forward(self) -> bool:
+        """Apply the next move; False once the log is exhausted."""
+        if self._idx >= len(self.moves):
+            return False
+        self.seek(self._idx + 1)
+        return True
+
+    def step_back(self) -> bool:
+        """Take back the last applied move; False at the start of the game."""
+        if self._idx == 0:
+            return False
+        self.seek(self._idx - 1)
+        return True
+
     def replay_all(self, refresh_ui):
-        for r, c, L, _ in self.moves:
-            self.logic.make_move(r, c, L)
+        self.seek(len(self.moves))
         refresh_ui()
 
-    def replay_stepwise(self, refresh_ui, ms_delay=800):
+    def replay_stepwise(self, refresh_ui, ms_delay=800, on_finished=None):
+        self.pause()
+        self._on_finished = on_finished
         self._timer = QTimer()
         self._timer.timeout.connect(lambda: self._step(refresh_ui))
         self._timer.start(ms_delay)
 
+    def pause(self):
+        if self._timer is not None:
+            self._timer.stop()
+
     def _step(self, refresh_ui):
-        if self._idx >= len(self.moves):
+        if not self.step_forward():
             self._timer.stop()
+            if self._on_finished:
+                self._on_finished()
             return
-        r, c, L, _ = self.moves[self._idx]
-        self.logic.make_move(r, c, L)
-        self._idx += 1
         refresh_ui()
+class SOSBoardWidget(QWidget):
+    """Single custom-painted board with SOS line overlays.
+
+    sync() compares the game's move history and SOS event list with what
+    has been drawn and repaints only the cells and line bounding boxes that
+    changed. Lines are painted from logic.sos_events in their owner's
+    colour, looked up per dirty cell through logic.lines_through.
+    """
+    cellClicked = pyqtSignal(int, int)
+
+    LINE_COLORS = {"Blue": QColor(33, 150, 243), "Red": QColor(229, 57, 53)}
+
+    def __init__(self, logic: SOSGameLogic, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(300, 300)
+        self.set_logic(logic)
+
+    def set_logic(self, logic: SOSGameLogic):
+        """Attach a (new) game and schedule a full repaint."""
+        self.logic = logic
+        self._drawn = []        # history records whose cells have been drawn
+        self._events = []       # sos_events entries whose lines have been drawn
+        self.sync()
+        self.update()
+
+    def _cell_size(self) -> int:
+        return max(1, min(self.width(), self.height()) // self.logic.size)
+
+    def _cell_rect(self, row: int, col: int) -> QRect:
+        size = self._cell_size()
+        return QRect(col * size, row * size, size, size)
+
+    def _line_rect(self, line_key) -> QRect:
+        (r0, c0), _, (r2, c2) = line_key
+        return self._cell_rect(r0, c0).united(self._cell_rect(r2, c2))
+
+    def sync(self):
+        """Bring the drawing in line with the game, repainting only what changed."""
+        for drawn, current, rect in ((self._drawn, self.logic._history, self._record_rect),
+                                     (self._events, self.logic.sos_events, self._event_rect)):
+            # undone entries first, then whatever was added since the last sync
+            while drawn and (len(drawn) > len(current)
+                             or drawn[-1] is not current[len(drawn) - 1]):
+                self.update(rect(drawn.pop()))
+            for entry in current[len(drawn):]:
+                drawn.append(entry)
+                self.update(rect(entry))
+
+    def _record_rect(self, record) -> QRect:
+        return self._cell_rect(record[0], record[1])
+
+    def _event_rect(self, event) -> QRect:
+        return self._line_rect(event[2])
+
+    def paintEvent(self, event):
+        dirty = event.rect()
+        size = self._cell_size()
+        n = self.logic.size
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(dirty, Qt.white)
+
+        first_row = max(0, dirty.top() // size)
+        last_row = min(n - 1, dirty.bottom() // size)
+        first_col = max(0, dirty.left() // size)
+        last_col = min(n - 1, dirty.right() // size)
+
+        grid_pen = QPen(QColor(180, 180, 180))
+        painter.setFont(QFont("Arial", max(6, size // 2), QFont.Bold))
+        for r in range(first_row, last_row + 1):
+            for c in range(first_col, last_col + 1):
+                rect = self._cell_rect(r, c)
+                painter.setPen(grid_pen)
+                painter.drawRect(rect.adjusted(0, 0, -1, -1))
+                letter = self.logic.board[r][c]
+                if letter != "-":
+                    painter.setPen(Qt.black)
+                    painter.drawText(rect, Qt.AlignCenter, letter)
+
+        # a line drawn over a dirty cell passes through it or one of its neighbours
+        events = set()
+        for r in range(max(0, first_row - 1), min(n - 1, last_row + 1) + 1):
+            for c in range(max(0, first_col - 1), min(n - 1, last_col + 1) + 1):
+                events.update(self.logic.lines_through(r, c))
+        for _, player, line_key in sorted(events):
+            (r0, c0), _, (r2, c2) = line_key
+            pen = QPen(self.LINE_COLORS[player])
+            pen.setWidth(max(2, size // 12))
+            pen.setCapStyle(Qt.RoundCap)
+            painter.setPen(pen)
+            painter.drawLine(self._cell_rect(r0, c0).center(), self._cell_rect(r2, c2).center())
+        painter.end()
+
+    def mousePressEvent(self, event):
+        size = self._cell_size()
+        row, col = event.y() // size, event.x() // size
+        if 0 <= row < self.logic.size and 0 <= col < self.logic.size:
+            self.cellClicked.emit(row, col)
+
+class ComputerMoveThread(QThread):
+    """Runs ComputerPlayer.choose_move on a copy of the game off the GUI thread."""
+    moveReady = pyqtSignal(object)      # (row, col, letter), or None when cancelled
+    progress = pyqtSignal(dict)
+
+    def __init__(self, player: ComputerPlayer, logic: SOSGameLogic, parent=None):
+        super().__init__(parent)
+        self.player = player
+        self.logic = logic.clone()
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        move = self.player.choose_move(self.logic, cancel=self.cancel_event,
+                                       progress=self.progress.emit)
+        self.moveReady.emit(move)
+
+    def cancel(self):
+        """Stop the search and wait for the thread to exit."""
+        self.cancel_event.set()
+        self.wait()
+
 class SOSGame(QMainWindow):
     def __init__(self, size=3, mode="simple", blue_type="human", red_type="human", record=False):
         super().__init__()
@@ -256,13 +406,15 @@ class SOSGame(QMainWindow):
         self.red_type = red_type
 
         # Create game logic
-        self.logic = SOSGameLogic(size, mode)
+        self.logic = make_game_logic(size, mode)
 
-        # Assign computer player if selected
+        # Assign computer players if selected
+        self.computers = {}
         if blue_type == "computer":
-            self.logic.computer = ComputerPlayer(player_color="Blue")
-        elif red_type == "computer":
-            self.logic.computer = ComputerPlayer(player_color="Red")
+            self.computers["Blue"] = ComputerPlayer(player_color="Blue")
+        if red_type == "computer":
+            self.computers["Red"] = ComputerPlayer(player_color="Red")
+        self._search: ComputerMoveThread | None = None
 
         self.initUI()
 
@@ -273,8 +425,35 @@ class SOSGame(QMainWindow):
             self._maybe_schedule_computer_turn()
 
     def _maybe_schedule_computer_turn(self):
-        if self.logic.computer and self.logic.current_player == self.logic.computer.player_color:
-            QTimer.singleShot(250, self.handle_computer_turn)
+        """Start a background search if a computer is to move and none is running."""
+        if self._search is not None or self.is_replaying:
+            return
+        player = self.computers.get(self.logic.current_player)
+        if player is None:
+            return
+        self._search = ComputerMoveThread(player, self.logic, self)
+        self._search.moveReady.connect(self.handle_computer_turn)
+        self._search.progress.connect(self.show_search_progress)
+        self.statusBar().showMessage(f"{self.logic.current_player} is thinking...")
+        self._search.start()
+
+    def cancel_computer_turn(self):
+        """Abort a running search; its result will be ignored."""
+        if self._search is not None:
+            search, self._search = self._search, None
+            search.cancel()
+            search.deleteLater()
+            self.statusBar().clearMessage()
+
+    def show_search_progress(self, info):
+        self.statusBar().showMessage(
+            f"{self.logic.current_player} is thinking... depth {info['depth']}, "
+            f"{info['nodes']} nodes"
+        )
+
+    def closeEvent(self, event):
+        self.cancel_computer_turn()
+        super().closeEvent(event)
 
     def initUI(self):
         self.setWindowTitle(
@@ -312,23 +491,27 @@ class SOSGame(QMainWindow):
         self.update_scoreboard()
         self.layout.addWidget(self.scoreboard)
 
-        self.grid_layout = QGridLayout()
-        self.buttons = [[None for _ in range(self.logic.size)]
-                        for _ in range(self.logic.size)]
-        self.buttons_flat = []          
-
-        for r in range(self.logic.size):
-            for c in range(self.logic.size):
-                btn = QPushButton(" ")
-                btn.setFixedSize(500 // self.logic.size,
-                                500 // self.logic.size)
-                btn.clicked.connect(lambda _, rr=r, cc=c:
-                                    self.make_move(rr, cc))
-                self.grid_layout.addWidget(btn, r, c)
-                self.buttons[r][c] = btn
-                self.buttons_flat.append(btn)
-
-        self.layout.addLayout(self.grid_layout)
+        self.board_widget = SOSBoardWidget(self.logic)
+        self.board_widget.setMinimumSize(500, 500)
+        self.board_widget.cellClicked.connect(self.make_move)
+        self.layout.addWidget(self.board_widget, stretch=1)
+
+        # replay controls, shown only while a log is being replayed
+        self.replay_bar = QWidget()
+        replay_layout = QHBoxLayout(self.replay_bar)
+        self.replay_back = QPushButton("<")
+        self.replay_back.clicked.connect(lambda: self.replay_seek(self.replay.position - 1))
+        self.replay_play = QPushButton("Pause")
+        self.replay_play.clicked.connect(self.toggle_replay_playback)
+        self.replay_forward = QPushButton(">")
+        self.replay_forward.clicked.connect(lambda: self.replay_seek(self.replay.position + 1))
+        self.replay_slider = QSlider(Qt.Horizontal)
+        self.replay_slider.valueChanged.connect(self.replay_seek)
+        for widget in (self.replay_back, self.replay_play, self.replay_forward):
+            replay_layout.addWidget(widget)
+        replay_layout.addWidget(self.replay_slider, stretch=1)
+        self.layout.addWidget(self.replay_bar)
+        self.replay_bar.hide()
     
     def update_label(self):
         piece = "S" if self.logic.current_player == "Blue" else "O"
@@ -336,8 +519,13 @@ class SOSGame(QMainWindow):
         self.label.setText(f"Current Player: <span style='color:{color};'>{self.logic.current_player} ({piece})</span>")
 
     def make_move(self, row, col):
+        # ignore clicks while a computer is to move or the cell is taken
+        if self._search is not None or self.logic.current_player in self.computers:
+            return
+        if not self.logic.is_valid_move(row, col):
+            return
         result = self.logic.make_move(row, col)
-        self.buttons[row][col].setText(self.logic.board[row][col])
+        self.board_widget.sync()
         self.update_label()
         self.update_scoreboard()
 
@@ -345,30 +533,33 @@ class SOSGame(QMainWindow):
             self.show_game_over_message(self.get_result_message(result))
             return
 
-        if self.logic.computer and self.logic.current_player == self.logic.computer.player_color:
-            QTimer.singleShot(500, self.handle_computer_turn)
+        self._maybe_schedule_computer_turn()
 
-    def handle_computer_turn(self):
-        move = self.logic.computer.choose_move(self.logic)
+    def handle_computer_turn(self, move):
+        """Apply the move found by the background search, if it is still wanted."""
+        search = self.sender()
+        if search is not self._search or search.cancel_event.is_set():
+            return
+        self._search = None
+        search.deleteLater()
+        self.statusBar().clearMessage()
         if move:
             row, col, letter = move
+            stats = search.player.last_result
             # Pass explicit letter chosen by the AI
-            result = self.logic.make_move(row, col, letter)
+            result = self.logic.make_move(row, col, letter,
+                                          search=stats.as_dict() if stats else None)
 
-            self.buttons[row][col].setText(self.logic.board[row][col])
+            self.board_widget.sync()
             self.update_label()
             self.update_scoreboard()
-            self.update()
 
             # Show result if game is over
             if result in ("blue_wins", "red_wins", "draw"):
                 self.show_game_over_message(self.get_result_message(result))
             else:
-                # If next player is also computer, keep going
-                if self.logic.current_player == "Blue" and self.blue_type == "computer":
-                    QTimer.singleShot(250, self.handle_computer_turn)
-                elif self.logic.current_player == "Red" and self.red_type == "computer":
-                    QTimer.singleShot(250, self.handle_computer_turn)
+                # If the next player is also a computer, keep going
+                self._maybe_schedule_computer_turn()
 
     def get_result_message(self, result):
         if result == "blue_wins":
@@ -387,26 +578,44 @@ class SOSGame(QMainWindow):
 
     def redraw_board(self):
         """Sync all widgets with self.logic’s current state."""
-        for r in range(self.logic.size):
-            for c in range(self.logic.size):
-                self.buttons[r][c].setText(self.logic.board[r][c])
-
+        self.board_widget.sync()
         self.update_label()
         self.update_scoreboard()
-        self.update()       
-
-        # Re-enable buttons once replay finishes
-        if hasattr(self, "replay") and self.replay._idx >= len(self.replay.moves):
-            for btn in self.buttons_flat:
-                btn.setEnabled(True)
 
-            if self.logic.mode == "general":
-                result_key = self.logic.determine_winner()  
-            else:  
-                last_player = self.replay.moves[-1][3]       
-                result_key = f"{last_player.lower()}_wins"
+        if getattr(self, "is_replaying", False) and hasattr(self, "replay"):
+            self.replay_slider.blockSignals(True)
+            self.replay_slider.setValue(self.replay.position)
+            self.replay_slider.blockSignals(False)
+
+    def replay_seek(self, index):
+        """Pause the replay and jump to the position after <index> moves."""
+        self.replay.pause()
+        self.replay_play.setText("Play")
+        self.replay.seek(index)
+        self.redraw_board()
+
+    def toggle_replay_playback(self):
+        if self.replay.is_playing:
+            self.replay.pause()
+            self.replay_play.setText("Play")
+            return
+        if self.replay.position >= len(self.replay.moves):
+            self.replay.seek(0)
+        self.replay_play.setText("Pause")
+        self.replay.replay_stepwise(self.redraw_board, ms_delay=600,
+                                    on_finished=self.finish_replay)
+
+    def finish_replay(self):
+        """Announce the logged result once playback reaches the last move."""
+        self.replay_play.setText("Play")
+        if self.logic.mode == "general":
+            result_key = self.logic.determine_winner()  
+        elif self.logic.sos_events:
+            result_key = f"{self.logic.sos_events[0][1].lower()}_wins"
+        else:
+            result_key = "draw"
 
-            self.show_game_over_message(self.get_result_message(result_key))
+        self.show_game_over_message(self.get_result_message(result_key))
 
     def show_game_over_message(self, message: str):
         """Game-over dialog for both live play and replay."""
@@ -421,13 +630,13 @@ class SOSGame(QMainWindow):
             if response == QMessageBox.Ok:
                 self.is_replaying = False
                 if hasattr(self, "replay"):
+                    self.replay.pause()
                     del self.replay
+                self.replay_bar.hide()
 
                 self.logic.reset_board(start_logging=True)
                 self.rebuild_board_widgets()
-
-                for btn in self.buttons_flat:
-                    btn.setEnabled(True)
+                self.board_widget.setEnabled(True)
 
             else:         
                 self.close()
@@ -441,19 +650,15 @@ class SOSGame(QMainWindow):
 
     def restart_game(self):
         """Restarts the game by resetting the board."""
-        self.logic = SOSGameLogic(self.logic.size, self.logic.mode)
-        self.update_label()
-        
-        # Reset button text
-        for row in range(self.logic.size):
-            for col in range(self.logic.size):
-                self.buttons[row][col].setText(" ")
-        
+        self.cancel_computer_turn()
+        self.logic = make_game_logic(self.logic.size, self.logic.mode)
+        self.board_widget.set_logic(self.logic)
         self.redraw_board()  # Refreshes the UI
+        self._maybe_schedule_computer_turn()
 
     def start_log_dialog(self):
         path, _ = QFileDialog.getSaveFileName(
-            self, "Save game log", "logs", "SOS logs (*.sos.json)")
+            self, "Save game log", "logs", "SOS logs (*.sos.jsonl)")
         if not path:
             self.record_from_setup = False
             self._maybe_schedule_computer_turn()
@@ -470,45 +675,64 @@ class SOSGame(QMainWindow):
 
     def open_and_replay(self):
         path, _ = QFileDialog.getOpenFileName(
-            self, "Open SOS log", "logs", "SOS logs (*.sos.json *.json)")
+            self, "Open SOS log", "logs", "SOS logs (*.sos.jsonl *.sos.json *.json *.sosb)")
         if not path:
             return
 
+        self.start_replay(path)
+
+    def pick_archive_game(self, path):
+        """Index of the game to replay from <path>: 0 unless an archive holds several.
+
+        Returns None when the player cancels the choice.
+        """
+        if Path(path).suffix != ".sosb":
+            return 0
+        with BinaryLogReader(path) as reader:
+            count = len(reader)
+        if count <= 1:
+            return 0
+        number, ok = QInputDialog.getInt(self, "Replay", f"Game to replay (1-{count}):",
+                                         1, 1, count)
+        return number - 1 if ok else None
+
+    def start_replay(self, path):
+        """Load <path> and play it back with the seek controls shown."""
+        self.cancel_computer_turn()
         try:
+            game = self.pick_archive_game(path)
+            if game is None:
+                return
             self.is_replaying = True
-            self.logic = SOSGameLogic()
-            self.replay = SOSReplay(self.logic)
-            self.replay.load_json(path)
+            self.replay = SOSReplay()
+            self.replay.load_log(path, game)
+            self.logic = self.replay.logic
         except Exception as exc:
+            self.is_replaying = False
             QMessageBox.warning(self, "Replay error", str(exc))
             return
 
         self.rebuild_board_widgets()
-
-        # lock UI during replay
-        for btn in self.buttons_flat:
-            btn.setEnabled(False)
-
-        self.replay.replay_stepwise(self.redraw_board, ms_delay=600)
+        if self.replay.truncated:
+            QMessageBox.warning(self, "Replay",
+                                "The log's last move was only partly written and was skipped.")
+
+        # lock the board during replay; the replay bar drives it instead
+        self.board_widget.setEnabled(False)
+        self.replay_slider.blockSignals(True)
+        self.replay_slider.setRange(0, len(self.replay.moves))
+        self.replay_slider.setValue(0)
+        self.replay_slider.blockSignals(False)
+        self.replay_bar.show()
+
+        self.replay_play.setText("Pause")
+        self.replay.replay_stepwise(self.redraw_board, ms_delay=600,
+                                    on_finished=self.finish_replay)
 
     def rebuild_board_widgets(self):
-        # Remove old widgets
-        for btn in self.buttons_flat:
-            self.grid_layout.removeWidget(btn)
-            btn.deleteLater()
-        self.buttons_flat.clear()
-
-        # Recreate buttons for new board size
-        self.buttons = [[None for _ in range(self.logic.size)] for _ in range(self.logic.size)]
-        for r in range(self.logic.size):
-            for c in range(self.logic.size):
-                btn = QPushButton(" ")
-                btn.setFixedSize(500 // self.logic.size, 500 // self.logic.size)
-                btn.clicked.connect(lambda _, rr=r, cc=c: self.make_move(rr, cc))
-                self.grid_layout.addWidget(btn, r, c)
-                self.buttons[r][c] = btn
-                self.buttons_flat.append(btn)
+        """Point the board at the current logic after its size or mode changed."""
+        self.board_widget.set_logic(self.logic)
 
         # Refresh labels
         self.setWindowTitle(f"SOS Game ({self.logic.mode.capitalize()} Mode) - {self.logic.size}x{self.logic.size}")
-        self.redraw_board()
\ No newline at end of file
+        self.redraw_board()
@@ -0,0 +1,267 @@
+"""Game-log formats.
+
+``sos-log-jsonl-v1`` is the streaming format written during play: a header
+record followed by one JSON object per move, appended as the game goes.
+Moves made by a computer player may carry a "search" object with the
+statistics of the search that chose them. The older ``sos-log-json-v1``
+files (one pretty-printed document) can still be read.
+
+The binary archive format packs many games into one file:
+
+    file header   b"SOSB" + version (u8)
+    game header   size (u16), mode (u8), code width (u8), move count (u32)
+    moves         one little-endian code per move of <code width> bytes,
+                  code = cell << 2 | letter_bit << 1 | player_bit
+
+where cell = row * size + col, letter_bit is 1 for "O" and player_bit is
+1 for "Red". Boards up to 8x8 take one byte per move, up to 128x128 two.
+
+    python -m sosLog pack logs/*.sos.json* --out archive.sosb
+"""
+from __future__ import annotations
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+FORMAT_JSON = "sos-log-json-v1"
+FORMAT_JSONL = "sos-log-jsonl-v1"
+FSYNC_POLICIES = ("never", "game", "move")
+
+Move = Tuple[int, int, str, str]    # (row, col, letter, player)
+
+
+class JsonlLogWriter:
+    """Append-only JSON Lines log with buffered writes.
+
+    fsync policy: "never" leaves durability to the OS, "game" syncs once
+    when the log is closed and "move" syncs after every move.
+    """
+
+    def __init__(self, path: str | Path, size: int, mode: str, fsync: str = "game"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, not {fsync!r}")
+        self.path = Path(path)
+        self.fsync = fsync
+        self._fp = self.path.open("w", encoding="utf-8")
+        self._write({"format": FORMAT_JSONL, "size": size, "mode": mode})
+
+    def _write(self, record: Dict) -> None:
+        self._fp.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def append(self, row: int, col: int, letter: str, player: str,
+               search: Optional[Dict] = None) -> None:
+        record = {"row": row, "col": col, "letter": letter, "player": player}
+        if search is not None:
+            record["search"] = search
+        self._write(record)
+        if self.fsync == "move":
+            self._sync()
+
+    def _sync(self) -> None:
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+
+    def close(self) -> None:
+        if self._fp.closed:
+            return
+        if self.fsync != "never":
+            self._sync()
+        self._fp.close()
+
+
+BINARY_MAGIC = b"SOSB"
+BINARY_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sB")
+_GAME_HEADER = struct.Struct("<HBBI")
+_MODES = ("simple", "general")
+_WIDTH_TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+
+def _code_width(size: int) -> int:
+    """Bytes needed per move code on a size x size board."""
+    if size * size * 4 <= 1 << 8:
+        return 1
+    if size * size * 4 <= 1 << 16:
+        return 2
+    return 4
+
+
+class BinaryLogWriter:
+    """Append whole games to a binary archive, creating it if needed."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fp = self.path.open("ab")
+        if self._fp.tell() == 0:
+            self._fp.write(_FILE_HEADER.pack(BINARY_MAGIC, BINARY_VERSION))
+
+    def write_game(self, size: int, mode: str, moves: Iterable[Move]) -> None:
+        width = _code_width(size)
+        codes = array(_WIDTH_TYPECODES[width])
+        for row, col, letter, player in moves:
+            codes.append((row * size + col) << 2 | (letter == "O") << 1 | (player == "Red"))
+        if sys.byteorder == "big":
+            codes.byteswap()
+        self._fp.write(_GAME_HEADER.pack(size, _MODES.index(mode), width, len(codes)))
+        self._fp.write(codes.tobytes())
+
+    def close(self) -> None:
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BinaryLogReader:
+    """Memory-mapped random access to the games of a binary archive.
+
+    Opening the reader indexes the game headers only; moves are decoded on
+    demand, either as (row, col, letter, player) tuples or as raw codes.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fp = self.path.open("rb")
+        if os.fstat(self._fp.fileno()).st_size < _FILE_HEADER.size:
+            # mmap cannot map an empty file
+            self._fp.close()
+            raise ValueError("truncated archive")
+        self._mm = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._index()
+        except ValueError:
+            self.close()
+            raise
+
+    def _index(self) -> None:
+        magic, version = _FILE_HEADER.unpack_from(self._mm, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError("Unrecognised log format")
+
+        # (size, mode, width, count, offset of first move code)
+        self._games: List[Tuple[int, str, int, int, int]] = []
+        offset = _FILE_HEADER.size
+        end = len(self._mm)
+        while offset < end:
+            if offset + _GAME_HEADER.size > end:
+                raise ValueError("truncated archive")
+            size, mode, width, count = _GAME_HEADER.unpack_from(self._mm, offset)
+            if mode >= len(_MODES) or width not in _WIDTH_TYPECODES:
+                raise ValueError("corrupt archive")
+            offset += _GAME_HEADER.size
+            if offset + width * count > end:
+                raise ValueError("truncated archive")
+            self._games.append((size, _MODES[mode], width, count, offset))
+            offset += width * count
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def codes(self, index: int) -> Tuple[int, str, array]:
+        """Return (size, mode, move codes) of one game without building tuples."""
+        size, mode, width, count, offset = self._games[index]
+        codes = array(_WIDTH_TYPECODES[width])
+        codes.frombytes(self._mm[offset:offset + width * count])
+        if sys.byteorder == "big":
+            codes.byteswap()
+        return size, mode, codes
+
+    def __getitem__(self, index: int) -> Dict:
+        size, mode, codes = self.codes(index)
+        moves = []
+        for code in codes:
+            row, col = divmod(code >> 2, size)
+            moves.append((row, col, "O" if code & 2 else "S", "Red" if code & 1 else "Blue"))
+        return {"size": size, "mode": mode, "moves": moves}
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(len(self._games)):
+            yield self[index]
+
+    def close(self) -> None:
+        self._mm.close()
+        self._fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_log(path: str | Path, game: int = 0) -> Dict:
+    """Load a log as {"size", "mode", "moves": [Move, ...]}.
+
+    Accepts JSON Lines, legacy JSON and binary archives; <game> picks the
+    game to load from an archive. A JSON Lines log whose last record was
+    only partly written loads without it and has "truncated" set.
+    """
+    with open(path, "rb") as fp:
+        is_binary = fp.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    if is_binary:
+        with BinaryLogReader(path) as reader:
+            return reader[game]
+
+    with open(path, encoding="utf-8") as fp:
+        first = fp.readline()
+        try:
+            header = json.loads(first)
+        except json.JSONDecodeError:
+            header = None
+
+        if isinstance(header, dict) and header.get("format") == FORMAT_JSONL:
+            moves: List[Move] = []
+            damaged = None
+            for number, line in enumerate(fp, start=2):
+                if not line.strip():
+                    continue
+                if damaged is not None:
+                    raise ValueError(f"line {damaged}: undecodable move record")
+                try:
+                    m = json.loads(line)
+                except json.JSONDecodeError:
+                    # a record cut short by a crash mid-append; only the last may be
+                    damaged = number
+                    continue
+                moves.append((m["row"], m["col"], m["letter"], m["player"]))
+            return {"size": header["size"], "mode": header["mode"], "moves": moves,
+                    "truncated": damaged is not None}
+
+        fp.seek(0)
+        data = json.load(fp)
+
+    if data.get("format") != FORMAT_JSON:
+        raise ValueError("Unrecognised log format")
+    return {
+        "size": data["size"],
+        "mode": data["mode"],
+        "moves": [(m["row"], m["col"], m["letter"], m["player"]) for m in data["moves"]],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SOS game-log tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="append JSON logs to a binary archive")
+    pack.add_argument("logs", nargs="+")
+    pack.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+
+    with BinaryLogWriter(args.out) as writer:
+        for path in args.logs:
+            data = read_log(path)
+            writer.write_game(data["size"], data["mode"], data["moves"])
+    print(f"packed {len(args.logs)} games into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Monte Carlo Tree Search for ComputerPlayer(strategy="mcts").
+
+Selection uses UCT; every node stores the wins of the player who made
+its move, so General mode extra turns need no special handling. Moves
+that hand the opponent an SOS are held back until a node has no other
+move or, by progressive widening, has been visited WIDEN_VISITS times
+(doubling for each further one) while its quiet moves win less than
+WIDEN_BELOW of their playouts. Playouts run on a flat copy of the
+board with the sosPlayout kernel, which completes an open SOS whenever
+one exists and otherwise plays random moves that avoid opening one. The
+search runs until the time budget or playout budget is spent, and the
+subtree under the chosen move is kept for the next call when the game
+continues from it.
+"""
+from __future__ import annotations
+import math
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sosPlayout import EMPTY, S, O, encode, flat_triplets, playout
+
+Move = Tuple[int, int, str]
+
+SPARSE_PLAYOUT_LIMIT = 200  # default playout length on sparse boards
+WIDEN_VISITS = 64           # visits before a node admits its first deferred move, doubling after
+WIDEN_BELOW = 0.5           # ... and only while its best child wins less often than this
+_CODES = {"S": S, "O": O}
+
+
+class MCTSNode:
+    __slots__ = ("move", "mover", "parent", "children", "untried", "deferred", "widened",
+                 "visits", "wins")
+
+    def __init__(self, move: Optional[Move] = None, mover: Optional[str] = None, parent=None):
+        self.move = move
+        self.mover = mover              # player who made <move>; wins are counted for them
+        self.parent = parent
+        self.children: List[MCTSNode] = []
+        self.untried: Optional[List[Move]] = None   # filled on first visit
+        self.deferred: Optional[List[Move]] = []    # moves that open an SOS; None once expanded
+        self.widened = 0                # deferred moves admitted by progressive widening
+        self.visits = 0
+        self.wins = 0.0
+
+
+class MCTS:
+    """UCT search over SOSGameLogic positions with tree reuse between calls.
+
+    <moves> returns the legal moves of a position, best candidates first
+    (ComputerPlayer._moves). playout_limit caps the moves per playout
+    (default: none, or SPARSE_PLAYOUT_LIMIT on sparse boards); a cut-off
+    playout is scored by the scores reached so far.
+    """
+
+    def __init__(self, moves: Callable, time_budget_ms: float = 1000,
+                 playouts: Optional[int] = None, exploration: float = 1.4,
+                 playout_limit: Optional[int] = None, seed=None):
+        self.moves = moves
+        self.time_budget_ms = time_budget_ms
+        self.playouts = playouts
+        self.exploration = exploration
+        self.playout_limit = playout_limit
+        self._rng = random.Random(seed)
+        self._root: Optional[MCTSNode] = None
+        self._root_path: List[Move] = []    # moves from the start of the game to _root
+
+    def search(self, game_logic, cancel=None) -> Tuple[Optional[Move], Dict]:
+        """Return (move, stats) for the side to move in <game_logic>."""
+        deadline = time.perf_counter() + self.time_budget_ms / 1000
+        path = [(row, col, game_logic.board[row][col]) for row, col, _, _ in game_logic._history]
+        root = self._reuse(path)
+        size = game_logic.size
+        board = game_logic.board
+        # kept in step with game_logic while the tree is walked
+        self._flat = encode(game_logic)[0]
+        self._triplets = flat_triplets(size)
+        if game_logic.sparse:
+            # mostly empty: sample cells at random instead of listing them
+            self._empties = None
+            cells = [r * size + c for r, c in game_logic.candidate_cells()]
+        else:
+            self._empties = cells = [r * size + c for r in range(size) for c in range(size)
+                                     if board[r][c] == "-"]
+        self._root_threats = [(i, code) for i in cells
+                              for code, counts in ((S, game_logic._threat_s),
+                                                   (O, game_logic._threat_o))
+                              if counts[i]]
+
+        playouts = 0
+        max_depth = 0
+        while (self.playouts is None or playouts < self.playouts) \
+                and not (cancel is not None and cancel.is_set()):
+            max_depth = max(max_depth, self._iterate(game_logic, root))
+            playouts += 1
+            if time.perf_counter() > deadline:
+                break
+            if root.untried == [] and not root.children:
+                break       # no legal moves
+
+        if not root.children:
+            return None, {"playouts": playouts, "depth": 0, "value": None,
+                          "tree_nodes": root.visits}
+        best = max(root.children, key=lambda child: child.visits)
+        # keep the chosen subtree for the next move of this game
+        best.parent = None
+        self._root = best
+        self._root_path = path + [best.move]
+        return best.move, {"playouts": playouts, "depth": max_depth,
+                           "value": best.wins / best.visits if best.visits else None,
+                           "tree_nodes": root.visits}
+
+    def _reuse(self, path: List[Move]) -> MCTSNode:
+        """The stored subtree matching <path>, or a fresh root."""
+        node = self._root
+        if node is not None and path[:len(self._root_path)] == self._root_path:
+            for move in path[len(self._root_path):]:
+                node = next((child for child in node.children if child.move == move), None)
+                if node is None:
+                    break
+            else:
+                node.parent = None
+                return node
+        return MCTSNode()
+
+    def _iterate(self, game, root: MCTSNode) -> int:
+        """One selection / expansion / playout / backup pass; returns the tree depth reached."""
+        node = root
+        pushed = 0
+        self._path_threats = []
+        winner = None
+        widen = False
+        log_c = self.exploration
+        while True:
+            if node.untried is None:
+                node.untried = list(reversed(self.moves(game)))
+            if node.untried or not node.children:
+                break       # expand here, or a finished game
+            if node.deferred and node.visits >= WIDEN_VISITS << node.widened \
+                    and max(child.wins / child.visits for child in node.children) < WIDEN_BELOW:
+                widen = True
+                break       # the quiet moves look lost: try one that opens an SOS
+            parent_log = math.log(node.visits)
+            node = max(node.children, key=lambda child: child.wins / child.visits
+                       + log_c * math.sqrt(parent_log / child.visits))
+            winner = self._apply(game, node.move)
+            pushed += 1
+            if winner is not None:
+                break
+
+        while winner is None and (node.untried or widen):
+            if widen:
+                # already known to open an SOS: expand it as it is
+                move = node.deferred.pop(0)
+                node.widened += 1
+            else:
+                move = node.untried.pop()
+            mover = game.current_player
+            threats = game.threat_count
+            slots = len(self._path_threats)
+            winner = self._apply(game, move)
+            if winner is None and not widen and node.deferred is not None \
+                    and game.threat_count > threats and not game._history[-1][3]:
+                # hand the opponent an SOS only when no quiet move is left
+                self._undo(game)
+                del self._path_threats[slots:]     # the slots it opened are gone again
+                node.deferred.append(move)
+                if not node.untried and not node.children:
+                    node.untried, node.deferred = node.deferred[::-1], None
+                continue
+            child = MCTSNode(move, mover, node)
+            node.children.append(child)
+            node = child
+            pushed += 1
+            break
+
+        if winner is None:
+            winner = self._playout(game)
+        depth = pushed
+        while node is not None:
+            node.visits += 1
+            if winner == node.mover:
+                node.wins += 1
+            elif winner == "draw":
+                node.wins += 0.5
+            node = node.parent
+        for _ in range(pushed):
+            self._undo(game)
+        return depth
+
+    def _apply(self, game, move: Move) -> Optional[str]:
+        """Push <move>; return the winner ("Blue", "Red" or "draw") if that ended the game."""
+        row, col, letter = move
+        mover = game.current_player
+        gained = game.push_move(row, col, letter)
+        index = row * game.size + col
+        self._flat[index] = _CODES[letter]
+        self._path_threats.extend((cell, _CODES[need]) for cell, need in game._slots(index))
+        if gained and game.mode == "simple":
+            return mover
+        if game.empty_count == 0:
+            return self._score_winner(game)
+        return None
+
+    def _undo(self, game):
+        row, col = game.pop_move()
+        self._flat[row * game.size + col] = EMPTY
+
+    def _score_winner(self, game) -> str:
+        blue, red = game.scores["Blue"], game.scores["Red"]
+        if game.mode == "simple" or blue == red:
+            return "draw"
+        return "Blue" if blue > red else "Red"
+
+    def _playout(self, game) -> str:
+        """Finish a copy of the flat board with the sosPlayout kernel."""
+        limit = self.playout_limit
+        if limit is None and game.sparse:
+            limit = SPARSE_PLAYOUT_LIMIT
+        scores = game.scores
+        return playout(bytearray(self._flat), game.size, self._triplets, game.mode == "simple",
+                       game.current_player == "Blue", scores["Blue"] - scores["Red"],
+                       game.empty_count, None if self._empties is None else self._empties[:],
+                       self._root_threats + self._path_threats, self._rng, limit)
@@ -0,0 +1,232 @@
+"""Fast random playouts on a flat board, in bulk and across processes.
+
+    python -m sosPlayout --size 15 --mode general --games 20000 --workers 4
+
+A playout skips everything make_move and push_move keep up to date
+(validation, logging, line sets, hashes, threat counters). The board is a
+bytearray of EMPTY/S/O codes indexed r * size + c and a move only looks at
+the triplets through its own cell. A triplet completes exactly once, when
+its last cell is filled, so counting SOS lines needs no line set.
+
+The policy is the one MCTS uses: complete an open SOS when there is one,
+otherwise play a random letter on a random empty cell, retrying up to
+SAFE_ATTEMPTS times when that would open an SOS for the opponent.
+"""
+from __future__ import annotations
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+EMPTY, S, O = 0, 1, 2           # same codes as sosBatch
+SAFE_ATTEMPTS = 10              # random picks rejected for opening an SOS before one is kept
+EAGER_CELLS = 64 * 64           # larger boards build triplets per cell on first use
+_CODES = {"-": EMPTY, "S": S, "O": O}
+_TRIPLET_CACHE: Dict[int, List[Tuple]] = {}
+
+
+def _cell_triplets(size: int, index: int) -> Tuple[Tuple[int, int, int], ...]:
+    """(first, middle, last) flat indices of every triplet through <index>."""
+    r, c = divmod(index, size)
+    triplets = []
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for k in range(3):
+            r0, c0 = r - k * dr, c - k * dc
+            r2, c2 = r0 + 2 * dr, c0 + 2 * dc
+            if 0 <= r0 < size and 0 <= c0 < size and 0 <= r2 < size and 0 <= c2 < size:
+                triplets.append((r0 * size + c0, (r0 + dr) * size + c0 + dc, r2 * size + c2))
+    return tuple(triplets)
+
+
+class _LazyTriplets(dict):
+    """Per-cell triplets of a large board, built when a playout first reaches the cell."""
+
+    def __init__(self, size: int):
+        super().__init__()
+        self.size = size
+
+    def __missing__(self, index):
+        triplets = self[index] = _cell_triplets(self.size, index)
+        return triplets
+
+
+def flat_triplets(size: int):
+    """Indexable by flat cell: the triplets through it, as (first, middle, last) indices."""
+    if size * size > EAGER_CELLS:
+        return _LazyTriplets(size)
+    triplets = _TRIPLET_CACHE.get(size)
+    if triplets is None:
+        triplets = _TRIPLET_CACHE[size] = [_cell_triplets(size, index)
+                                           for index in range(size * size)]
+    return triplets
+
+
+def encode(game_logic) -> Tuple[bytearray, bool, int]:
+    """Flat board of <game_logic>, whether Blue is to move, and Blue's score minus Red's."""
+    board = bytearray(game_logic.size ** 2)
+    for index, letter in game_logic.occupied():
+        board[index] = _CODES[letter]
+    scores = game_logic.scores
+    return board, game_logic.current_player == "Blue", scores["Blue"] - scores["Red"]
+
+
+def open_slots(board, triplets) -> List[Tuple[int, int]]:
+    """(cell, code) for every empty cell where that letter completes an SOS."""
+    slots = []
+    for index, code in enumerate(board):
+        if not code:
+            continue
+        for a, b, c in triplets[index]:
+            first, middle, last = board[a], board[b], board[c]
+            if middle == O:
+                if first == S and not last:
+                    slots.append((c, S))
+                elif not first and last == S:
+                    slots.append((a, S))
+            elif not middle and first == S and last == S:
+                slots.append((b, O))
+    return slots
+
+
+def playout(board: bytearray, size: int, triplets, simple: bool, blue_to_move: bool,
+            margin: int, free: int, empties: Optional[List[int]], pending: List[Tuple[int, int]],
+            rng: random.Random, limit: Optional[int] = None) -> str:
+    """Play one game out on <board>, in place, and return "Blue", "Red" or "draw".
+
+    margin is Blue's score minus Red's and free the number of empty cells.
+    <empties> lists the empty cells, or is None to sample the whole board
+    (for large, mostly empty boards); <pending> holds the (cell, code)
+    slots already open. Both lists are consumed. After <limit> moves the
+    game is scored as it stands.
+    """
+    moves = 0
+    while free and (limit is None or moves < limit):
+        forced = False
+        while pending:
+            index, code = pending.pop()
+            if not board[index]:
+                forced = True
+                break
+        attempts = 0 if forced else SAFE_ATTEMPTS
+        while True:
+            if not forced:
+                while True:
+                    if empties is None:
+                        index = rng.randrange(size * size)
+                    else:
+                        i = rng.randrange(len(empties))
+                        index = empties[i]
+                        empties[i] = empties[-1]
+                        empties.pop()
+                    if not board[index]:
+                        break
+                code = S if rng.random() < 0.5 else O
+            board[index] = code
+            gained = 0
+            slots = []
+            for a, b, c in triplets[index]:
+                first, middle, last = board[a], board[b], board[c]
+                if middle == O:
+                    if first == S:
+                        if last == S:
+                            gained += 1
+                        elif not last:
+                            slots.append((c, S))
+                    elif not first and last == S:
+                        slots.append((a, S))
+                elif not middle and first == S and last == S:
+                    slots.append((b, O))
+            if gained or not slots or not attempts or empties == []:
+                break
+            board[index] = EMPTY
+            if empties is not None:
+                empties.append(index)
+            attempts -= 1
+        free -= 1
+        moves += 1
+        if gained:
+            if simple:
+                return "Blue" if blue_to_move else "Red"
+            margin += gained if blue_to_move else -gained
+        else:
+            blue_to_move = not blue_to_move
+        pending += slots
+    if simple or not margin:
+        return "draw"
+    return "Blue" if margin > 0 else "Red"
+
+
+def run_playouts(board: bytes, size: int, mode: str, blue_to_move: bool, margin: int,
+                 count: int, seed=None, limit: Optional[int] = None) -> Dict[str, int]:
+    """Play <count> playouts from one flat position; return wins per "Blue", "Red", "draw"."""
+    rng = random.Random(seed)
+    triplets = flat_triplets(size)
+    simple = mode == "simple"
+    free = board.count(EMPTY)
+    empties = None if size * size > EAGER_CELLS else [i for i, code in enumerate(board)
+                                                      if not code]
+    slots = open_slots(board, triplets)
+    results = {"Blue": 0, "Red": 0, "draw": 0}
+    for _ in range(count):
+        winner = playout(bytearray(board), size, triplets, simple, blue_to_move, margin, free,
+                         None if empties is None else empties[:], slots[:], rng, limit)
+        results[winner] += 1
+    return results
+
+
+def playout_stats(game_logic, count: int, workers: int = 1, seed=None,
+                  limit: Optional[int] = None, pool: Optional[ProcessPoolExecutor] = None
+                  ) -> Dict[str, int]:
+    """Win counts of <count> playouts from the position of <game_logic>.
+
+    With several workers the playouts are split into one batch per worker
+    and run on <pool>, or on a pool created for this call.
+    """
+    board, blue_to_move, margin = encode(game_logic)
+    position = (bytes(board), game_logic.size, game_logic.mode, blue_to_move, margin)
+    return _run_batches(position, count, workers, seed, limit, pool)
+
+
+def _run_batches(position, count, workers, seed, limit, pool):
+    if workers <= 1:
+        return run_playouts(*position, count, seed, limit)
+    rng = random.Random(seed)
+    batches = [count // workers + (i < count % workers) for i in range(workers)]
+    own_pool = pool is None
+    if own_pool:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(run_playouts, *position, batch, rng.getrandbits(64), limit)
+                   for batch in batches if batch]
+        totals = {"Blue": 0, "Red": 0, "draw": 0}
+        for future in futures:
+            for winner, wins in future.result().items():
+                totals[winner] += wins
+    finally:
+        if own_pool:
+            pool.shutdown()
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Random SOS playouts from the empty board.")
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--mode", choices=("simple", "general"), default="general")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=None, help="moves per playout")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    position = (bytes(args.size * args.size), args.size, args.mode, True, 0)
+    results = _run_batches(position, args.games, args.workers, args.seed, args.limit, None)
+    elapsed = time.perf_counter() - start
+    for winner, wins in results.items():
+        print(f"{winner:5} {wins:8} {wins / args.games:7.1%}")
+    print(f"{args.games} playouts in {elapsed:.2f}s ({args.games / elapsed:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Headless computer-vs-computer batch play.
+
+    python -m sosSelfPlay --games 200 --size 5 --mode general \\
+        --blue minimax:time_budget_ms=50 --red random --workers 4
+
+A player spec is ``strategy[:key=value,...]`` where the keys are
+ComputerPlayer keyword arguments. Wins, draws and losses are counted for
+the --blue spec; with --swap the two specs change colours every other game.
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sosGameLogic import ComputerPlayer, SearchProfiler, make_game_logic
+from sosLog import BinaryLogWriter
+
+
+def parse_spec(spec: str) -> Dict:
+    """Turn 'minimax:max_depth=3,time_budget_ms=100' into ComputerPlayer kwargs.
+
+    Values are parsed as int, then float; "none" becomes None.
+    """
+    strategy, _, options = spec.partition(":")
+    kwargs = {"strategy": strategy}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        for convert in (int, float):
+            try:
+                kwargs[key] = convert(value)
+                break
+            except ValueError:
+                pass
+        else:
+            kwargs[key] = None if value == "none" else value
+    return kwargs
+
+
+def play_game(size: int, mode: str, blue_spec: str, red_spec: str,
+              seed: Optional[int] = None, record_path: Optional[Path] = None,
+              keep_moves: bool = False, profiler: Optional[SearchProfiler] = None) -> Dict:
+    """Play one complete game between two ComputerPlayers and return its summary.
+
+    With keep_moves the summary also carries the (row, col, letter, player)
+    list. Recorded logs include the search statistics of every move.
+    """
+    logic = make_game_logic(size, mode)
+    players = {}
+    for offset, (color, spec) in enumerate((("Blue", blue_spec), ("Red", red_spec))):
+        kwargs = parse_spec(spec)
+        kwargs.setdefault("seed", None if seed is None else seed + offset)
+        kwargs.setdefault("profiler", profiler)
+        players[color] = ComputerPlayer(player_color=color, **kwargs)
+
+    if record_path is not None:
+        logic.start_recording(record_path)
+
+    start = time.perf_counter()
+    result = "continue"
+    moves = []
+    while result == "continue":
+        player = logic.current_player
+        stats = players[player].search(logic)
+        row, col, letter = stats.move
+        result = logic.make_move(row, col, letter,
+                                 search=stats.as_dict() if record_path is not None else None)
+        moves.append((row, col, letter, player))
+
+    summary = {
+        "result": result,
+        "moves": len(moves),
+        "scores": dict(logic.scores),
+        "sos_count": len(logic.sos_lines),
+        "seconds": time.perf_counter() - start,
+    }
+    if keep_moves:
+        summary["move_list"] = moves
+    return summary
+
+
+def _play_task(task, profiler=None) -> Dict:
+    index, size, mode, first, second, swapped, seed, record_dir, keep_moves = task
+    blue_spec, red_spec = (second, first) if swapped else (first, second)
+    record_path = None
+    if record_dir is not None:
+        record_path = Path(record_dir) / f"{index}.sos.jsonl"
+    summary = play_game(size, mode, blue_spec, red_spec,
+                        None if seed is None else seed + 2 * index, record_path,
+                        keep_moves, profiler)
+    summary["index"] = index
+    summary["first_color"] = "Red" if swapped else "Blue"
+    return summary
+
+
+def run_batch(games: int, size: int, mode: str, first: str, second: str,
+              swap: bool = False, workers: Optional[int] = None,
+              seed: Optional[int] = None, record_dir: Optional[str] = None,
+              record_bin: Optional[str] = None,
+              profiler: Optional[SearchProfiler] = None) -> Dict:
+    """Play <games> games across a process pool and aggregate the results.
+
+    record_dir receives one JSON Lines log per game; record_bin is a binary
+    archive the finished games are appended to. A profiler covers every
+    search and makes the games run inline.
+    """
+    if record_dir is not None:
+        Path(record_dir).mkdir(parents=True, exist_ok=True)
+    tasks = [(i, size, mode, first, second, swap and i % 2 == 1, seed, record_dir,
+              record_bin is not None)
+             for i in range(games)]
+    archive = BinaryLogWriter(record_bin) if record_bin is not None else None
+
+    start = time.perf_counter()
+    summaries = []
+    pool = Pool(workers) if workers != 1 and profiler is None else None
+    try:
+        if pool is not None:
+            results = pool.imap_unordered(_play_task, tasks)
+        else:
+            results = (_play_task(task, profiler) for task in tasks)
+        for summary in results:
+            if archive is not None:
+                archive.write_game(size, mode, summary.pop("move_list"))
+            summaries.append(summary)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if archive is not None:
+            archive.close()
+    elapsed = time.perf_counter() - start
+    return summarize(summaries, elapsed)
+
+
+def summarize(summaries: List[Dict], elapsed: float) -> Dict:
+    """Win/draw/loss counts for the first spec plus throughput figures."""
+    wins = draws = losses = 0
+    for summary in summaries:
+        if summary["result"] == "draw":
+            draws += 1
+        elif summary["result"] == f"{summary['first_color'].lower()}_wins":
+            wins += 1
+        else:
+            losses += 1
+    games = len(summaries)
+    return {
+        "games": games,
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "blue_wins": sum(s["result"] == "blue_wins" for s in summaries),
+        "red_wins": sum(s["result"] == "red_wins" for s in summaries),
+        "avg_moves": sum(s["moves"] for s in summaries) / games if games else 0.0,
+        "avg_sos": sum(s["sos_count"] for s in summaries) / games if games else 0.0,
+        "seconds": elapsed,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch SOS self-play between computer players.")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--mode", choices=("simple", "general"), default="simple")
+    parser.add_argument("--blue", default="minimax:time_budget_ms=100",
+                        help="player spec whose results are reported")
+    parser.add_argument("--red", default="random", help="opponent player spec")
+    parser.add_argument("--swap", action="store_true",
+                        help="swap colours every other game")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="process count (default: one per CPU, 1 runs inline)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record-dir", default=None,
+                        help="write every game log into this directory")
+    parser.add_argument("--record-bin", default=None,
+                        help="append every game to this binary archive")
+    parser.add_argument("--profile", default=None,
+                        help="run under cProfile and write the stats to this file; games "
+                             "then play in this process and --workers is ignored")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    profiler = SearchProfiler() if args.profile else None
+    if profiler is not None and args.workers not in (None, 1):
+        print("--profile plays every game in this process; ignoring --workers", file=sys.stderr)
+    stats = run_batch(args.games, args.size, args.mode, args.blue, args.red,
+                      swap=args.swap, workers=args.workers, seed=args.seed,
+                      record_dir=args.record_dir, record_bin=args.record_bin,
+                      profiler=profiler)
+    if profiler is not None:
+        # on stderr so that --json output stays parseable
+        print(profiler.dump(args.profile), file=sys.stderr)
+        print("search time histogram:", profiler.histogram(), file=sys.stderr)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"{stats['games']} games in {stats['seconds']:.2f}s "
+          f"({stats['games_per_second']:.1f} games/s)")
+    print(f"{args.blue}: {stats['wins']} W / {stats['draws']} D / {stats['losses']} L "
+          f"vs {args.red}")
+    print(f"blue wins {stats['blue_wins']}, red wins {stats['red_wins']}, "
+          f"avg moves {stats['avg_moves']:.1f}, avg SOS {stats['avg_sos']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""Headless SOS game server over TCP or a Unix socket.
+
+    python -m sosServer serve --port 7777 --workers 4
+    python -m sosServer loadtest --port 7777 --sessions 2000 --connections 50
+
+Clients send one command per line; every command is answered by zero or
+more MOVED lines followed by exactly one terminating OK, OVER or ERR line:
+
+    NEW <size> <simple|general> [<blue>] [<red>]
+        start a game; <blue>/<red> are "human" (the default) or a computer
+        player spec as in sosSelfPlay, e.g. minimax:time_budget_ms=50
+    MOVE <id> <row> <col> <S|O>
+    BOARD <id>                      -> BOARD <id> <size> <row>/<row>/...
+    CLOSE <id>
+
+    MOVED <id> <row> <col> <letter> <player> <result>
+    OK <id> <player to move>        OVER <id> <result>        ERR <id|-> <message>
+
+Computer turns are played straight after the move that hands them the turn
+and run in an executor (a process pool by default), so a slow search only
+delays its own game. Games belong to the connection that created them and
+are dropped when it closes.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from sosGameLogic import SOSGameLogic, ComputerPlayer, make_game_logic
+from sosSelfPlay import parse_spec
+
+
+def _computer_move(logic: SOSGameLogic, options: Dict):
+    """Executor entry point: one search for the side to move."""
+    return ComputerPlayer(player_color=logic.current_player, **options).choose_move(logic)
+
+
+class Session:
+    """One game in progress and the computer player specs of its colours."""
+
+    def __init__(self, game_id: int, size: int, mode: str, computers: Dict[str, Dict]):
+        self.id = game_id
+        self.logic = make_game_logic(size, mode)
+        self.computers = computers      # colour -> ComputerPlayer keyword arguments
+        self.result = "continue"
+        self.lock = asyncio.Lock()
+
+
+class GameServer:
+    """Keeps the sessions and answers the line protocol."""
+
+    def __init__(self, executor: Optional[Executor] = None):
+        self.executor = executor        # None: the event loop's default thread pool
+        self.sessions: Dict[int, Session] = {}
+        self.clients = 0                # open connections
+        self._ids = itertools.count(1)
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        owned: Set[int] = set()
+        write_lock = asyncio.Lock()
+        tasks = set()
+        self.clients += 1
+
+        async def answer(words: List[str]) -> None:
+            game = words[1] if len(words) > 1 and words[0] != "NEW" else "-"
+            try:
+                lines = await self.dispatch(words, owned)
+            except ValueError as exc:
+                lines = [f"ERR {game} {exc}"]
+            except Exception as exc:
+                # e.g. a failed search in the executor; the client still gets its line
+                lines = [f"ERR {game} {type(exc).__name__}: {exc}"]
+            writer.write(("\n".join(lines) + "\n").encode())
+            async with write_lock:
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                words = line.decode().split()
+                if words:
+                    # commands run concurrently; each game's lock keeps its moves in order
+                    task = asyncio.ensure_future(answer(words))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            # the client stopped sending: finish what it already asked for
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            for task in tasks:
+                task.cancel()
+        finally:
+            for game_id in owned:
+                self.sessions.pop(game_id, None)
+            writer.close()
+            self.clients -= 1
+
+    async def dispatch(self, words: List[str], owned: Set[int]) -> List[str]:
+        command, args = words[0].upper(), words[1:]
+        if command == "NEW":
+            return await self._new(args, owned)
+        if not args:
+            raise ValueError(f"{command} needs a game id")
+        session = self.sessions.get(int(args[0]) if args[0].isdigit() else -1)
+        if session is None or session.id not in owned:
+            raise ValueError("unknown game")
+        if command == "MOVE":
+            return await self._move(session, args[1:])
+        # wait for the game's earlier commands so its replies keep request order
+        if command == "BOARD":
+            async with session.lock:
+                rows = "/".join("".join(row) for row in session.logic.board)
+                return [f"BOARD {session.id} {session.logic.size} {rows}", self._status(session)]
+        if command == "CLOSE":
+            async with session.lock:
+                self.sessions.pop(session.id, None)
+                owned.discard(session.id)
+                return [f"OK {session.id} closed"]
+        raise ValueError(f"unknown command {command}")
+
+    async def _new(self, args: List[str], owned: Set[int]) -> List[str]:
+        if len(args) < 2 or not args[0].isdigit() or args[1] not in ("simple", "general"):
+            raise ValueError("usage: NEW <size> <simple|general> [<blue>] [<red>]")
+        size = int(args[0])
+        if not 3 <= size <= 1000:
+            raise ValueError("size must be between 3 and 1000")
+        computers = {}
+        for color, spec in zip(("Blue", "Red"), args[2:4]):
+            if spec != "human":
+                options = parse_spec(spec)
+                try:
+                    ComputerPlayer(player_color=color, **options)     # reject bad specs now
+                except TypeError as exc:
+                    raise ValueError(f"bad player spec {spec}: {exc}") from None
+                computers[color] = options
+        session = Session(next(self._ids), size, args[1], computers)
+        self.sessions[session.id] = session
+        owned.add(session.id)
+        async with session.lock:
+            lines = await self._computer_turns(session)
+        return lines + [self._status(session)]
+
+    async def _move(self, session: Session, args: List[str]) -> List[str]:
+        if len(args) != 3 or not (args[0].isdigit() and args[1].isdigit()) \
+                or args[2] not in ("S", "O"):
+            raise ValueError("usage: MOVE <id> <row> <col> <S|O>")
+        row, col, letter = int(args[0]), int(args[1]), args[2]
+        async with session.lock:
+            logic = session.logic
+            if session.result != "continue":
+                raise ValueError("game is over")
+            if logic.current_player in session.computers:
+                raise ValueError("not your turn")
+            if not logic.is_valid_move(row, col):
+                raise ValueError(f"invalid move at ({row}, {col})")
+            lines = [self._play(session, row, col, letter)]
+            lines += await self._computer_turns(session)
+        return lines + [self._status(session)]
+
+    async def _computer_turns(self, session: Session) -> List[str]:
+        """Let computer players move for as long as it is their turn."""
+        lines = []
+        loop = asyncio.get_running_loop()
+        while session.result == "continue" and session.logic.current_player in session.computers:
+            options = session.computers[session.logic.current_player]
+            move = await loop.run_in_executor(self.executor, _computer_move,
+                                              session.logic.clone(), options)
+            lines.append(self._play(session, *move))
+        return lines
+
+    def _play(self, session: Session, row: int, col: int, letter: str) -> str:
+        player = session.logic.current_player
+        session.result = session.logic.make_move(row, col, letter)
+        return f"MOVED {session.id} {row} {col} {letter} {player} {session.result}"
+
+    def _status(self, session: Session) -> str:
+        if session.result != "continue":
+            return f"OVER {session.id} {session.result}"
+        return f"OK {session.id} {session.logic.current_player}"
+
+
+async def serve(host: str = "127.0.0.1", port: int = 7777, unix: Optional[str] = None,
+                executor: Optional[Executor] = None) -> None:
+    server = GameServer(executor)
+    if unix:
+        listener = await asyncio.start_unix_server(server.handle_client, path=unix)
+    else:
+        listener = await asyncio.start_server(server.handle_client, host, port)
+    address = unix or f"{host}:{port}"
+    print(f"sosServer listening on {address}")
+    async with listener:
+        await listener.serve_forever()
+
+
+class _Connection:
+    """Load-test client side of one socket, routing replies to the games on it."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.games: Dict[str, asyncio.Queue] = {}
+        self.pending: asyncio.Queue = asyncio.Queue()   # replies to NEW, in order
+        self._drain_lock = asyncio.Lock()
+
+    async def route(self) -> None:
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return
+            words = line.decode().split()
+            queue = self.games.get(words[1]) if len(words) > 1 else None
+            await (queue or self.pending).put(words)
+
+    async def request(self, line: str, queue: asyncio.Queue) -> List[List[str]]:
+        """Send one command and collect its reply lines up to the terminator."""
+        self.writer.write((line + "\n").encode())
+        async with self._drain_lock:
+            await self.writer.drain()
+        replies = []
+        while True:
+            words = await queue.get()
+            replies.append(words)
+            if words[0] in ("OK", "OVER", "ERR"):
+                return replies
+
+
+async def _new_game(conn: _Connection, size: int, mode: str, red: str) -> str:
+    replies = await conn.request(f"NEW {size} {mode} human {red}", conn.pending)
+    if replies[-1][0] == "ERR":
+        raise RuntimeError(" ".join(replies[-1]))
+    game_id = replies[-1][1]
+    conn.games[game_id] = asyncio.Queue()
+    return game_id
+
+
+async def _play_one(conn: _Connection, game_id: str, size: int, rng: random.Random,
+                    latencies: List[float]) -> None:
+    """Play random moves for the client's side until the game ends, then close it."""
+    queue = conn.games[game_id]
+    empty = {(r, c) for r in range(size) for c in range(size)}
+    status = "OK"
+    while status == "OK" and empty:
+        row, col = rng.choice(sorted(empty))
+        start = time.perf_counter()
+        replies = await conn.request(f"MOVE {game_id} {row} {col} {rng.choice('SO')}", queue)
+        latencies.append(time.perf_counter() - start)
+        for words in replies:
+            if words[0] == "MOVED":
+                empty.discard((int(words[2]), int(words[3])))
+        status = replies[-1][0]
+        if status == "ERR":
+            raise RuntimeError(" ".join(replies[-1]))
+    await conn.request(f"CLOSE {game_id}", queue)
+    del conn.games[game_id]
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def load_test(host: str = "127.0.0.1", port: int = 7777, unix: Optional[str] = None,
+                    sessions: int = 1000, connections: int = 20, size: int = 5,
+                    mode: str = "general", red: str = "human", seed: int = 0) -> Dict:
+    """Play <sessions> concurrent games over <connections> sockets and time every MOVE.
+
+    Blue moves at random; <red> is "human" (also random, from the client) or
+    a computer spec played by the server.
+    """
+    conns = []
+    for _ in range(connections):
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        conns.append(_Connection(reader, writer))
+    routers = [asyncio.ensure_future(conn.route()) for conn in conns]
+
+    latencies: List[float] = []
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    # NEW replies carry no id the client knows yet, so open each socket's games in turn
+    game_ids = []
+    for i, conn in enumerate(conns):
+        game_ids.append([await _new_game(conn, size, mode, red)
+                         for _ in range(i, sessions, connections)])
+    await asyncio.gather(*(
+        _play_one(conn, game_id, size, random.Random(rng.getrandbits(32)), latencies)
+        for conn, ids in zip(conns, game_ids) for game_id in ids
+    ))
+    elapsed = time.perf_counter() - start
+
+    for conn in conns:
+        conn.writer.close()
+        await conn.writer.wait_closed()
+    for router in routers:
+        router.cancel()
+    return {
+        "sessions": sessions,
+        "moves": len(latencies),
+        "seconds": elapsed,
+        "moves_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless SOS game server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "loadtest"):
+        sub = commands.add_parser(name)
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--port", type=int, default=7777)
+        sub.add_argument("--unix", default=None, help="Unix socket path instead of TCP")
+        if name == "serve":
+            sub.add_argument("--workers", type=int, default=None,
+                             help="processes for computer moves (default: one per CPU)")
+        else:
+            sub.add_argument("--sessions", type=int, default=1000)
+            sub.add_argument("--connections", type=int, default=20)
+            sub.add_argument("--size", type=int, default=5)
+            sub.add_argument("--mode", choices=("simple", "general"), default="general")
+            sub.add_argument("--red", default="human",
+                             help='"human" or a computer spec played by the server')
+            sub.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        with ProcessPoolExecutor(args.workers) as executor:
+            try:
+                asyncio.run(serve(args.host, args.port, args.unix, executor))
+            except KeyboardInterrupt:
+                pass
+        return
+    stats = asyncio.run(load_test(args.host, args.port, args.unix, args.sessions,
+                                  args.connections, args.size, args.mode, args.red, args.seed))
+    print(f"{stats['sessions']} games, {stats['moves']} moves in {stats['seconds']:.2f}s "
+          f"({stats['moves_per_second']:.0f} moves/s)")
+    print(f"move latency p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, "
+          f"max {stats['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()